@@ -1,8 +1,12 @@
 import random
 import os
-import sqlite3
 import random
 
+# Share the pygame_shooter modules package (collision broadphase, storage etc.)
+import shooter_path
+from modules import storage
+from modules.sortedboard import TopScores
+
 # --- Optional: Turtle intro (runs briefly, then auto-closes) ---
 # We import lazily inside the function so headless setups won't fail on import.
 
@@ -37,40 +41,35 @@ def show_intro_turtle(show: bool = True, duration_sec: float = 2.0):
 DB_PATH = os.path.join(os.path.dirname(__file__), "game.db")
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            player TEXT NOT NULL,
-            score INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    conn = storage.connect(DB_PATH)
+    with conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scores (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
         )
-        """
-    )
-    conn.commit()
-    conn.close()
+        # Serves get_high_scores without sorting the whole table
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_scores_score ON scores (score DESC, created_at)")
+
 
+# Best rows, filled on first read and patched by save_score
+_high_scores = TopScores()
 
 def save_score(player: str, score: int):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("INSERT INTO scores (player, score) VALUES (?, ?)", (player, int(score)))
-    conn.commit()
-    conn.close()
+    conn = storage.connect(DB_PATH)
+    with conn:
+        cur = conn.execute("INSERT INTO scores (player, score) VALUES (?, ?)", (player, int(score)))
+        row = conn.execute("SELECT id, player, score, created_at FROM scores WHERE id = ?", (cur.lastrowid,)).fetchone()
+    _high_scores.add(row)
 
 
 def get_high_scores(limit: int = 10):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        "SELECT player, score, created_at FROM scores ORDER BY score DESC, created_at ASC LIMIT ?",
-        (limit,),
-    )
-    rows = c.fetchall()
-    conn.close()
-    return rows
+    return _high_scores.top(storage.connect(DB_PATH), limit)
 
 
 # --- Tkinter UI (Menu + Scoreboard) ---
@@ -155,20 +154,50 @@ def show_final_scores_dialog(score: int):
 
 
 # --- Pygame Game Implementation ---
+from itertools import repeat
 import pygame
 
+from modules.assetcache import load_sound
+from modules.audio import AudioManager
+from modules.collision import SpatialHash
+from modules.entities import EntityPool
+from modules.profiler import GcMonitor
+from modules.starfield import Starfield
+from modules.timestep import FixedTimestep, lerp
+
+class RectPool(EntityPool):
+    """Same-sized rects as top-left x/y plus a vertical speed, packed by swap-remove"""
+    columns = {"seq": "Q", "x": "i", "y": "i", "speed": "i"}
+
+    def __init__(self, width: int, height: int, capacity: int = 64):
+        self.width = width
+        self.height = height
+        super().__init__(capacity)
+
+    def spawn(self, x: int, y: int, speed: int) -> int:
+        slot = self.acquire()
+        self.x[slot] = x
+        self.y[slot] = y
+        self.speed[slot] = speed
+        return slot
+
 class SpaceShooterGame:
     WIDTH = 900
     HEIGHT = 650
     FPS = 60
+    TICK_MS = 1000 / FPS
+    RENDER_FPS = FPS
 
     def __init__(self, player_name: str):
         self.player_name = player_name
         pygame.init()
 
-        self.shoot_sound = pygame.mixer.Sound("media/laser.mp3")
-        self.hit_sound = pygame.mixer.Sound("media/explosion.wav")
-        self.game_over_sound = pygame.mixer.Sound("media/over.mp3")
+        # Pre-decoded PCM from the asset cache after the first run, played on reserved channel groups
+        self.audio = AudioManager()
+        self.audio.init()
+        self.audio.register("shoot", load_sound("media/laser.mp3"), "weapon", 0)
+        self.audio.register("hit", load_sound("media/explosion.wav"), "impact", 1)
+        self.audio.register("game_over", load_sound("media/over.mp3"), "event", 2)
 
         # Background music (looping)
         pygame.mixer.music.load("media/game.mp3")
@@ -192,15 +221,21 @@ class SpaceShooterGame:
 
         # Game state (Rects for positions/collisions)
         self.player = self.player_img.get_rect(midbottom=(self.WIDTH // 2, self.HEIGHT - 30))
+        self.prev_player = self.player.topleft
         self.player_speed = 7
-        self.bullets = []  # list of Rect
+        self.bullets = RectPool(*self.bullet_img.get_size())
         self.bullet_speed = -10
-        self.enemies = []  # list of Rect
+        self.enemies = RectPool(*self.enemy_img.get_size())
         self.enemy_speed_min = 1
         self.enemy_speed_max = 2
         self.enemy_spawn_timer = 0
         self.enemy_spawn_interval = 1600  # ms
-        self.enemy_speeds = {}
+        self.grid = SpatialHash()
+        self.stars = Starfield.twinkling(80, (self.WIDTH, self.HEIGHT))
+        self.frame = 0
+        # Slots hit this tick, reused every update
+        self.dead = set()
+        self.spent = []
 
         self.score = 0
         self.lives = 3
@@ -209,14 +244,12 @@ class SpaceShooterGame:
         self.big_font = pygame.font.SysFont("Arial", 36, bold=True)
 
     def spawn_enemy(self):
-        rect = self.enemy_img.get_rect(
-            topleft=(random.randint(0, self.WIDTH - self.enemy_img.get_width()), -30)
-        )
+        x = random.randint(0, self.WIDTH - self.enemies.width)
         speed = random.randint(self.enemy_speed_min, self.enemy_speed_max)
-        self.enemies.append(rect)
-        self.enemy_speeds[id(rect)] = speed
+        self.enemies.spawn(x, -30, speed)
 
     def handle_input(self):
+        self.prev_player = self.player.topleft
         keys = pygame.key.get_pressed()
         if keys[pygame.K_LEFT]:
             self.player.x -= self.player_speed
@@ -231,77 +264,91 @@ class SpaceShooterGame:
         self.player.clamp_ip(self.screen.get_rect())
 
     def shoot(self):
-        # Spawn bullet rect at player position
-        b = self.bullet_img.get_rect(midbottom=(self.player.centerx, self.player.top))
-        self.bullets.append(b)
-        self.shoot_sound.play()
+        # Spawn bullet at player position (midbottom on the player's top edge)
+        bullets = self.bullets
+        bullets.spawn(self.player.centerx - bullets.width // 2, self.player.top - bullets.height, self.bullet_speed)
+        self.audio.play("shoot")
 
     def update(self, dt_ms):
+        # the star twinkle is timed in ticks, so it runs at the same speed at any render rate
+        self.frame += 1
+
         # spawn enemies
         self.enemy_spawn_timer += dt_ms
         if self.enemy_spawn_timer >= self.enemy_spawn_interval:
             self.enemy_spawn_timer = 0
             self.spawn_enemy()
 
-        # move bullets
-        for b in self.bullets:
-            b.y += self.bullet_speed
-        self.bullets = [b for b in self.bullets if b.bottom > 0]
-
-        # move enemies
-        for e in self.enemies:
-            e.y += self.enemy_speeds.get(id(e), 3)
-
-        # off-screen enemies reduce lives
-        still = []
-        for e in self.enemies:
-            if e.top > self.HEIGHT:
+        # move bullets, dropping those above the screen (highest slot first, as swap-remove requires)
+        bullets, enemies = self.bullets, self.enemies
+        bx, by, bw, bh = bullets.x, bullets.y, bullets.width, bullets.height
+        for s in range(bullets.count - 1, -1, -1):
+            by[s] += self.bullet_speed
+            if by[s] + bh <= 0:
+                bullets.release(s)
+
+        # move enemies; off-screen enemies reduce lives
+        ex, ey, ew, eh = enemies.x, enemies.y, enemies.width, enemies.height
+        for s in range(enemies.count - 1, -1, -1):
+            ey[s] += enemies.speed[s]
+            if ey[s] > self.HEIGHT:
                 self.lives -= 1
-            else:
-                still.append(e)
-        self.enemies = still
-
-        # collisions: bullet vs enemy
-        remaining_enemies = []
-        for e in self.enemies:
-            hit = False
-            for b in list(self.bullets):
-                if e.colliderect(b):
-                    self.score += 10
-                    hit = True
-                    self.bullets.remove(b)
-                    self.hit_sound.play()
-                    break
-            if not hit:
-                remaining_enemies.append(e)
-        self.enemies = remaining_enemies
+                enemies.release(s)
+
+        # collisions: bullet vs enemy (each bullet can only hit once)
+        dead, spent, grid = self.dead, self.spent, self.grid
+        grid.reset()
+        for j in range(bullets.count):
+            grid.insert_box(j, bx[j], by[j], bw, bh)
+        for i in range(enemies.count if bullets.count else 0):
+            j = grid.first_overlap(ex[i], ey[i], ew, eh, bx, by, bw, bh)
+            if j >= 0:
+                dead.add(i)
+                spent.append(j)
+                grid.remove_box(j, bx[j], by[j], bw, bh)  # Spent: later enemies cannot take it
+                self.score += 10
+                self.audio.play("hit")
 
         # collisions: enemy vs player
-        for e in list(self.enemies):
-            if e.colliderect(self.player):
+        p = self.player
+        for i in range(enemies.count):
+            if (ex[i] < p.right and p.x < ex[i] + ew and ey[i] < p.bottom and p.y < ey[i] + eh
+                    and i not in dead):
                 self.lives -= 1
-                self.enemies.remove(e)
+                dead.add(i)
+
+        spent.sort()
+        for i in sorted(dead, reverse=True):
+            enemies.release(i)
+        for j in reversed(spent):
+            bullets.release(j)
+        dead.clear()
+        spent.clear()
 
         if self.lives <= 0:
             self.running = False
 
-    def draw(self):
+    def draw(self, alpha: float = 1.0):
+        # alpha interpolates between the last two fixed ticks; bullets and
+        # enemies move at constant speed, so step them back by (1 - alpha)
+        back = 1.0 - alpha
         self.screen.fill((10, 10, 18))
 
-        # background stars
-        for _ in range(80):
-            x = random.randint(0, self.WIDTH - 1)
-            y = random.randint(0, self.HEIGHT - 1)
-            self.screen.fill((255, 255, 255), ((x, y), (1, 1)))
+        # background stars, twinkling in one blits() call
+        self.stars.draw(self.screen, self.frame)
 
         # --- Draw with images instead of shapes ---
-        self.screen.blit(self.player_img, self.player)
-
-        for b in self.bullets:
-            self.screen.blit(self.bullet_img, b)
-
-        for e in self.enemies:
-            self.screen.blit(self.enemy_img, e)
+        px, py = self.prev_player
+        self.screen.blit(self.player_img, (lerp(px, self.player.x, alpha), lerp(py, self.player.y, alpha)))
+
+        # One blits() call per texture
+        bullets, enemies = self.bullets, self.enemies
+        bx, by, dy = bullets.x, bullets.y, self.bullet_speed * back
+        self.screen.blits(zip(repeat(self.bullet_img), [(bx[s], by[s] - dy) for s in range(bullets.count)]),
+                          doreturn=False)
+        ex, ey, speeds = enemies.x, enemies.y, enemies.speed
+        self.screen.blits(zip(repeat(self.enemy_img), [(ex[s], ey[s] - speeds[s] * back) for s in range(enemies.count)]),
+                          doreturn=False)
 
         # HUD
         hud = self.font.render(
@@ -315,8 +362,12 @@ class SpaceShooterGame:
         shoot_cooldown = 200  # ms
         last_shot = 0
 
+        # Simulation runs in fixed ticks; the clock only caps the render rate
+        timestep = FixedTimestep(self.FPS)
+        gc_monitor = GcMonitor().start()
+
         while self.running:
-            dt = self.clock.tick(self.FPS)
+            self.clock.tick(self.RENDER_FPS)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
@@ -329,13 +380,20 @@ class SpaceShooterGame:
                             self.shoot()
                             last_shot = now
 
-            self.handle_input()
-            self.update(dt)
-            self.draw()
+            for _ in range(timestep.advance()):
+                self.handle_input()
+                self.update(self.TICK_MS)
+                if not self.running:
+                    break
+            self.audio.flush()
+            self.draw(timestep.alpha)
             pygame.display.flip()
 
+        gc_monitor.stop()
+        print(gc_monitor.report())
         pygame.mixer.music.stop()
-        self.game_over_sound.play()
+        self.audio.play("game_over")
+        self.audio.flush()
         pygame.time.delay(5000)
         pygame.quit()
         return self.score
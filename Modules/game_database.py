@@ -1,41 +1,38 @@
-import sqlite3
+# Tuned, reused connections shared with the pygame_shooter package
+import shooter_path
+from modules import storage
+from modules.sortedboard import TopScores
 
 DATABASE = 'db/game.db'
 
 def init_db():
-    db_connection = sqlite3.connect(DATABASE)
-    db_cursor = db_connection.cursor()
-    db_cursor.execute("""
-        CREATE TABLE IF NOT EXISTS scores(
-            id INTEGER PRIMARY KEY,
-            player TEXT NOT NULL,
-            score INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)
-        """)
-    db_connection.commit()
-    db_connection.close()
+    db_connection = storage.connect(DATABASE)
+    with db_connection:
+        db_connection.execute("""
+            CREATE TABLE IF NOT EXISTS scores(
+                id INTEGER PRIMARY KEY,
+                player TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)
+            """)
+        db_connection.execute("CREATE INDEX IF NOT EXISTS ix_scores_score ON scores (score DESC, created_at)")
 
 
+# Best rows, filled on first read and patched by save_score
+_highest = TopScores()
+
 def save_score(player, score):
-    db_connection = sqlite3.connect(DATABASE)
-    db_cursor = db_connection.cursor()
-    db_cursor.execute("""
-        INSERT INTO scores(player, score) VALUES (?, ?)
-    """,(player, int(score))
-    )
-    db_connection.commit()
-    db_connection.close()
+    db_connection = storage.connect(DATABASE)
+    with db_connection:
+        cursor = db_connection.execute("""
+            INSERT INTO scores(player, score) VALUES (?, ?)
+        """,(player, int(score))
+        )
+        row = db_connection.execute(
+            "SELECT id, player, score, created_at FROM scores WHERE id = ?", (cursor.lastrowid,)
+        ).fetchone()
+    _highest.add(row)
 
 
 def get_highest_score(limit = 10):
-    db_connection = sqlite3.connect(DATABASE)
-    db_cursor = db_connection.cursor()
-    db_cursor.execute(
-        """
-            SELECT player, score, created_at FROM scores ORDER BY score DESC, created_at ASC LIMIT ?
-        """, (limit,),
-    )
-    rows = db_cursor.fetchall()
-    db_connection.close()
-
-    return rows
+    return _highest.top(storage.connect(DATABASE), limit)
@@ -0,0 +1,12 @@
+"""
+Makes the pygame_shooter modules package importable from these scripts
+
+Import this before any `from modules import ...`; importing it again is a no-op.
+"""
+import os
+import sys
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pygame_shooter")
+
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
@@ -0,0 +1,3 @@
+"""
+Benchmarks for PyGame Shooter hot paths
+"""
@@ -0,0 +1,100 @@
+"""
+Benchmark sound effect loading and playback under heavy fire
+
+Compares decoding each sound file against loading its pre-decoded PCM from
+the asset cache, then replays the sound events of a busy Hard game through
+plain Sound.play() and through AudioManager, counting the calls that reach
+the mixer and the peak number of voices, on the dummy audio driver.
+
+Run from the pygame_shooter directory:
+    python -m benchmarks.bench_audio
+"""
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import random
+import time
+import pygame
+from modules import assetcache
+from modules.assets import SOUND_FILES
+from modules.audio import AudioManager
+from modules.simulation import GameState, step, INPUT_FIRE, INPUT_LEFT, INPUT_RIGHT
+
+FRAMES = 3600
+
+def load_ms(load, path, repeats: int = 5):
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        load(path)
+    return (time.perf_counter() - t0) / repeats * 1000
+
+def frame_events(frames: int):
+    """The sound events of each frame of a Hard game with spawns cranked up and the fire button held"""
+    rng = random.Random(1)
+    state = GameState("Hard", seed=1)
+    state.cfg = dict(state.cfg, spawn_rate=2)
+    frames_events = []
+    for _ in range(frames):
+        events = []
+        # Two ticks a frame, as on a display running at half the tick rate
+        for _ in range(2):
+            step(state, INPUT_FIRE | rng.choice((0, INPUT_LEFT, INPUT_RIGHT)))
+            events.extend(state.events)
+            state.lives = 3
+        frames_events.append(events)
+    return frames_events
+
+def busy_channels():
+    return sum(pygame.mixer.Channel(i).get_busy() for i in range(pygame.mixer.get_num_channels()))
+
+def play_direct(sounds, frames_events):
+    calls = peak = 0
+    t0 = time.perf_counter()
+    for events in frames_events:
+        for name in events:
+            sounds[name].play()
+            calls += 1
+        peak = max(peak, busy_channels())
+    return (time.perf_counter() - t0) * 1000, calls, peak
+
+def play_managed(sounds, frames_events):
+    audio = AudioManager()
+    audio.init()
+    audio.load(sounds)
+    peak = 0
+    t0 = time.perf_counter()
+    for events in frames_events:
+        for name in events:
+            audio.play(name)
+        audio.flush()
+        peak = max(peak, busy_channels())
+    elapsed = (time.perf_counter() - t0) * 1000
+    audio.stop()
+    return elapsed, audio.played, peak, audio
+
+def main():
+    # Media paths are relative to modules/, where the game runs
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "modules"))
+    pygame.mixer.init()
+    print(f"{'sound':<22} {'decode ms':>10} {'cached ms':>10}")
+    # The game's effects are WAVs; powerup.mp3 stands in for MP3 effects like dxfgx's
+    for path in list(SOUND_FILES.values()) + ["../media/powerup.mp3"]:
+        assetcache.load_sound(path)  # Bake
+        decode = load_ms(pygame.mixer.Sound, path)
+        cached = load_ms(assetcache.load_sound, path)
+        print(f"{path:<22} {decode:>10.2f} {cached:>10.2f}")
+
+    sounds = {name: assetcache.load_sound(path) for name, path in SOUND_FILES.items()}
+    frames_events = frame_events(FRAMES)
+    total = sum(map(len, frames_events))
+    print(f"\n{FRAMES} frames, {total} sound events")
+    direct_ms, direct_calls, direct_peak = play_direct(sounds, frames_events)
+    pygame.mixer.stop()
+    managed_ms, managed_calls, managed_peak, audio = play_managed(sounds, frames_events)
+    print(f"{'playback':<9} {'ms':>8} {'plays':>7} {'peak voices':>12}")
+    print(f"{'direct':<9} {direct_ms:>8.1f} {direct_calls:>7} {direct_peak:>12}")
+    print(f"{'managed':<9} {managed_ms:>8.1f} {managed_calls:>7} {managed_peak:>12}"
+          f"   ({audio.stolen} voices taken over, {audio.dropped} dropped)")
+
+if __name__ == "__main__":
+    main()
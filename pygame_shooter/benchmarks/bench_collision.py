@@ -0,0 +1,40 @@
+"""
+Benchmark the spatial-hash broadphase against the nested collision loop
+
+Run from the pygame_shooter directory:
+    python -m benchmarks.bench_collision
+"""
+import random
+import time
+from modules.config import WIDTH, HEIGHT
+from modules.collision import SpatialHash, find_hits, find_hits_naive
+
+def make_scene(count: int, seed: int = 0):
+    """Build half enemies (36x36) and half bullets (6x12) spread over the play field"""
+    rng = random.Random(seed)
+    enemies = [(rng.randint(0, WIDTH - 36), rng.randint(-30, HEIGHT), 36, 36) for _ in range(count // 2)]
+    bullets = [(rng.randint(0, WIDTH - 6), rng.randint(0, HEIGHT), 6, 12) for _ in range(count - count // 2)]
+    return enemies, bullets
+
+def best_of(fn, repeat: int):
+    """Return the fastest wall time of fn() over repeat runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+def main():
+    grid = SpatialHash()
+    print(f"{'entities':>9} {'naive ms':>10} {'hash ms':>10} {'speedup':>8}")
+    for count, repeat in ((100, 50), (1000, 5), (10000, 1)):
+        enemies, bullets = make_scene(count)
+        for consume in (False, True):
+            assert find_hits(enemies, bullets, consume, grid) == find_hits_naive(enemies, bullets, consume)
+        naive = best_of(lambda: find_hits_naive(enemies, bullets), repeat)
+        hashed = best_of(lambda: find_hits(enemies, bullets, grid=grid), repeat)
+        print(f"{count:>9} {naive:>10.3f} {hashed:>10.3f} {naive / hashed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
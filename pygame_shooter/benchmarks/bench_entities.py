@@ -0,0 +1,92 @@
+"""
+Benchmark the array-backed enemy pool against per-enemy dicts
+
+Reports time per frame for move + cull + respawn, memory per live entity,
+net memory allocated across steady-state frames and the garbage
+collections those frames set off.
+
+Run from the pygame_shooter directory:
+    python -m benchmarks.bench_entities
+"""
+import math
+import random
+import statistics
+import time
+import tracemalloc
+from modules.config import HEIGHT
+from modules.entities import EnemyPool
+from modules.profiler import GcMonitor
+
+FRAMES = 200
+# Each size is measured this many times, alternating dicts and pool, and the median kept
+ROUNDS = 5
+
+def dict_frame(enemies, frame, rng):
+    """One frame of the old list-of-dicts movement, cull and respawn"""
+    for e in enemies:
+        e["y"] += e["speed"]
+        e["x"] += math.sin((frame + e["y"]) * 0.03) * 2
+    kept = [e for e in enemies if e["y"] - e["size"] < HEIGHT]
+    for _ in range(len(enemies) - len(kept)):
+        kept.append({"x": rng.randint(20, 880), "y": -30, "speed": 4, "shape": "asteroid", "size": 18})
+    return kept
+
+def pool_frame(pool, frame, rng):
+    """One frame of pooled movement, cull and respawn"""
+    before = pool.count
+    pool.move(frame, HEIGHT)
+    for _ in range(before - pool.count):
+        pool.spawn(rng.randint(20, 880), -30, 4, "asteroid", 18)
+    return pool
+
+def run(step, state, rng):
+    """Time FRAMES frames and measure net traced memory growth and GC collections"""
+    for frame in range(FRAMES):
+        state = step(state, frame, rng)
+    gc_monitor = GcMonitor().start()
+    for frame in range(FRAMES, FRAMES * 2):
+        state = step(state, frame, rng)
+    gc_monitor.stop()
+    # Timed without tracemalloc, whose hooks slow allocation-heavy code most
+    t0 = time.perf_counter()
+    for frame in range(FRAMES * 2, FRAMES * 3):
+        state = step(state, frame, rng)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for frame in range(FRAMES * 3, FRAMES * 4):
+        state = step(state, frame, rng)
+    grown = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return elapsed / FRAMES * 1000, grown, sum(gc_monitor.collections)
+
+def dict_bytes(count, rng):
+    """Traced bytes per enemy for a list of dicts"""
+    tracemalloc.start()
+    enemies = [{"x": float(rng.randint(20, 880)), "y": float(rng.randint(0, HEIGHT)), "speed": 4, "shape": "asteroid", "size": 18}
+               for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / count, enemies
+
+def main():
+    print(f"{'enemies':>8} {'dict ms':>9} {'pool ms':>9} {'dict B/ent':>11} {'pool B/ent':>11} {'dict grow':>10} {'pool grow':>10}"
+          f" {'dict gcs':>9} {'pool gcs':>9}")
+    for count in (100, 1000, 10000):
+        dict_times, pool_times = [], []
+        for _ in range(ROUNDS):
+            rng = random.Random(0)
+            per_dict, enemies = dict_bytes(count, rng)
+            pool = EnemyPool(count)
+            for e in enemies:
+                pool.spawn(e["x"], e["y"], e["speed"], e["shape"], e["size"])
+            dict_ms, dict_grow, dict_gcs = run(dict_frame, enemies, rng)
+            pool_ms, pool_grow, pool_gcs = run(pool_frame, pool, rng)
+            dict_times.append(dict_ms)
+            pool_times.append(pool_ms)
+        dict_ms, pool_ms = statistics.median(dict_times), statistics.median(pool_times)
+        print(f"{count:>8} {dict_ms:>9.3f} {pool_ms:>9.3f} {per_dict:>11.1f} {pool.bytes_per_entity():>11.1f} {dict_grow:>10} {pool_grow:>10}"
+              f" {dict_gcs:>9} {pool_gcs:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark leaderboard reads from the in-memory SortedBoard against SQLite
+
+Fills a scores table, then times a mode filter switch (count + first
+window), a top-20 read and a write-through insert, from the indexed
+database and from per-mode boards.
+
+Run from the pygame_shooter directory:
+    python -m benchmarks.bench_leaderboard
+"""
+import os
+import random
+import tempfile
+import time
+from modules import storage
+from modules.database import MODES
+from modules.sortedboard import SortedBoard
+
+ROWS = 100000
+READS = 2000
+WINDOW = 16
+
+CREATE = """CREATE TABLE scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, player TEXT NOT NULL, mode TEXT NOT NULL,
+    score INTEGER NOT NULL, duration_sec REAL NOT NULL, played_at TEXT NOT NULL)"""
+INDEX = "CREATE INDEX ix_scores_mode_score_played ON scores (mode, score, played_at)"
+WINDOW_SQL = ("SELECT * FROM scores WHERE mode = ? ORDER BY score DESC, played_at DESC, id DESC "
+              "LIMIT ? OFFSET ?")
+COUNT_SQL = "SELECT COUNT(*) FROM scores WHERE mode = ?"
+
+def score_key(row):
+    return (row[3], row[5], row[0])
+
+def per_call_us(fn, n):
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - t0) / n * 1e6
+
+def main():
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = storage.connect(os.path.join(tmp, "bench.db"))
+        conn.execute(CREATE)
+        conn.execute(INDEX)
+        conn.executemany("INSERT INTO scores (player, mode, score, duration_sec, played_at) VALUES (?, ?, ?, ?, ?)",
+                         ((f"p{i % 500}", MODES[i % 3], rng.randint(0, 20000), 60.0, f"2024-01-01T{i:08d}")
+                          for i in range(ROWS)))
+        conn.commit()
+
+        t0 = time.perf_counter()
+        boards = {}
+        for mode in MODES:
+            boards[mode] = SortedBoard(score_key, reverse=True)
+            boards[mode].fill(conn.execute(WINDOW_SQL, (mode, boards[mode].capacity, 0)).fetchall(),
+                              conn.execute(COUNT_SQL, (mode,)).fetchone()[0])
+        print(f"warm {len(MODES)} boards: {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+        def db_switch(i):
+            mode = MODES[i % 3]
+            conn.execute(COUNT_SQL, (mode,)).fetchone()
+            conn.execute(WINDOW_SQL, (mode, WINDOW, 0)).fetchall()
+
+        def cache_switch(i):
+            board = boards[MODES[i % 3]]
+            board.window(0, WINDOW)
+
+        def db_top(i):
+            conn.execute(WINDOW_SQL, (MODES[i % 3], 20, 0)).fetchall()
+
+        def cache_top(i):
+            boards[MODES[i % 3]].window(0, 20)
+
+        next_id = [ROWS + 1]
+
+        def cache_add(i):
+            row = (next_id[0], "new", MODES[i % 3], rng.randint(0, 20000), 60.0, "2025-01-01")
+            next_id[0] += 1
+            boards[row[2]].add(row)
+
+        print(f"{'read':<14}{'sqlite us':>12}{'cache us':>12}{'speedup':>10}")
+        for name, db_fn, cache_fn in (("filter switch", db_switch, cache_switch), ("top 20", db_top, cache_top)):
+            db_us = per_call_us(db_fn, READS)
+            cache_us = per_call_us(cache_fn, READS)
+            print(f"{name:<14}{db_us:>12.1f}{cache_us:>12.2f}{db_us / cache_us:>9.0f}x")
+        print(f"write-through insert: {per_call_us(cache_add, READS):.2f} us")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
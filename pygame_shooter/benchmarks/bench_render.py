@@ -0,0 +1,150 @@
+"""
+Benchmark batched sprite drawing and the wrap-around background
+
+Draws the same bullets and enemies with the old per-entity loop (dict
+lookup, None check and blit for each) and with draw_sprites' per-texture
+blits(), then the old doubled-width background against ScrollingBackground,
+and the launcher's and dxfgx's per-star loops against Starfield, on a dummy
+display.
+
+The "fill ms" column replays the batch's finished (surface, position)
+sequences with no Python work per frame, which is the floor any batching
+can reach. Blending the pixels takes most of each frame, so batching
+measured only 1.02-1.3x over the loop here (1.02-1.12x at 5000 sprites),
+and even free batching would stay under the 1.2-1.4x of loop/fill.
+
+Run from the pygame_shooter directory:
+    python -m benchmarks.bench_render
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import math
+from itertools import repeat
+import random
+import statistics
+import time
+import pygame
+from modules.background import ScrollingBackground
+from modules.config import WIDTH, HEIGHT
+from modules.entities import SHAPES
+from modules.game import draw_sprites
+from modules.render import FullRenderer, SpriteBatch
+from modules.simulation import GameState
+from modules.starfield import Starfield
+from modules.timestep import lerp
+
+FRAMES = 200
+# Sprite timings alternate the two versions and keep the median round, as single runs vary widely
+ROUNDS = 9
+
+def loop_sprites(canvas, state, assets, alpha):
+    """The per-entity drawing loop draw_game used before batching"""
+    bullets = state.bullets
+    for s in bullets.slots():
+        y = lerp(bullets.py[s], bullets.y[s], alpha)
+        if assets["bullet"]:
+            canvas.blit(assets["bullet"], (bullets.x[s], y))
+    enemies = state.enemies
+    for s in enemies.slots():
+        size = enemies.size[s]
+        x = lerp(enemies.px[s], enemies.x[s], alpha)
+        y = lerp(enemies.py[s], enemies.y[s], alpha)
+        img = assets["enemies"][SHAPES[enemies.shape[s]]]
+        if img:
+            canvas.blit(img, (x - size, y - size))
+
+def scene(count: int):
+    """A Hard game with count // 2 enemies and as many bullets on screen"""
+    rng = random.Random(count)
+    state = GameState("Hard", seed=count)
+    for _ in range(count // 2):
+        state.enemies.spawn(rng.randint(20, WIDTH - 20), rng.randint(0, HEIGHT), 4, "asteroid", 18)
+        state.bullets.spawn(rng.randint(0, WIDTH - 6), rng.randint(0, HEIGHT))
+    return state
+
+def per_frame_ms(draw, canvas, state, assets):
+    t0 = time.perf_counter()
+    for _ in range(FRAMES):
+        draw(canvas, state, assets, 0.5)
+    return (time.perf_counter() - t0) / FRAMES * 1000
+
+def doubled_background(screen, bg, frame):
+    """The draw_background used before: a WIDTH*2 surface blitted twice"""
+    bg_x = -(frame % WIDTH)
+    screen.blit(bg, (bg_x, 0))
+    screen.blit(bg, (bg_x + WIDTH, 0))
+
+def background_ms(draw, screen, bg):
+    t0 = time.perf_counter()
+    for frame in range(FRAMES):
+        draw(screen, bg, frame)
+    return (time.perf_counter() - t0) / FRAMES * 1000
+
+def launcher_stars(screen, frame):
+    """The launcher's stars before Starfield: a sin() and a draw.circle per star"""
+    for i in range(70):
+        x = (i * 31 + frame * 2) % WIDTH
+        y = (i * 13 + int(math.sin((frame + i) * 0.05) * 50)) % HEIGHT
+        pygame.draw.circle(screen, (200, 200, 255), (x, y), 2)
+
+def flicker_stars(screen, frame):
+    """dxfgx's stars before Starfield: two randint() and a fill per star"""
+    for _ in range(80):
+        x = random.randint(0, WIDTH - 1)
+        y = random.randint(0, HEIGHT - 1)
+        screen.fill((255, 255, 255), ((x, y), (1, 1)))
+
+def stars_ms(draw, screen):
+    t0 = time.perf_counter()
+    for frame in range(FRAMES * 5):
+        draw(screen, frame)
+    return (time.perf_counter() - t0) / (FRAMES * 5) * 1000
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    canvas = FullRenderer(screen)
+    enemy = pygame.Surface((50, 50), pygame.SRCALPHA).convert_alpha()
+    enemy.fill((200, 60, 60, 200))
+    bullet = pygame.Surface((24, 48), pygame.SRCALPHA).convert_alpha()
+    bullet.fill((255, 255, 255, 220))
+    assets = {"bullet": bullet, "enemies": {shape: enemy for shape in SHAPES}}
+
+    print(f"{'sprites':>8} {'loop ms':>9} {'batch ms':>9} {'fill ms':>9} {'speedup':>8} {'ceiling':>8}")
+    for count in (100, 500, 2000, 5000):
+        state = scene(count)
+        sprites = SpriteBatch()
+        batched = lambda canvas, state, assets, alpha: draw_sprites(canvas, state, assets, alpha, sprites)
+        batched(canvas, state, assets, 0.5)
+        built = [(surf, list(dests)) for surf, dests in sprites.groups.items()]
+
+        def fill(canvas, state, assets, alpha):
+            for surf, dests in built:
+                canvas.blits(zip(repeat(surf), dests))
+
+        rounds = [[per_frame_ms(draw, canvas, state, assets) for draw in (loop_sprites, batched, fill)]
+                  for _ in range(ROUNDS)]
+        loop, batch, floor = (statistics.median(r[k] for r in rounds) for k in range(3))
+        print(f"{count:>8} {loop:>9.3f} {batch:>9.3f} {floor:>9.3f} {loop / batch:>7.2f}x {loop / floor:>7.2f}x")
+
+    source = pygame.Surface((640, 480))
+    source.fill((20, 30, 60))
+    doubled = pygame.transform.scale(source, (WIDTH * 2, HEIGHT)).convert()
+    tiled = ScrollingBackground([(pygame.transform.scale(source, (WIDTH, HEIGHT)).convert(), 1.0)])
+    old = background_ms(doubled_background, screen, doubled)
+    new = background_ms(lambda screen, bg, frame: bg.draw(screen, frame), screen, tiled)
+    old_mb = doubled.get_bytesize() * doubled.get_width() * doubled.get_height() / 2 ** 20
+    print(f"\n{'background':<11} {'ms/frame':>9} {'MB':>6}")
+    print(f"{'doubled':<11} {old:>9.3f} {old_mb:>6.2f}")
+    print(f"{'tiled':<11} {new:>9.3f} {tiled.nbytes() / 2 ** 20:>6.2f}")
+
+    drifting, twinkling = Starfield.drifting(), Starfield.twinkling()
+    print(f"\n{'stars':<11} {'loop ms':>9} {'field ms':>9} {'speedup':>8}")
+    for name, loop, field in (("launcher", launcher_stars, drifting), ("dxfgx", flicker_stars, twinkling)):
+        old = stars_ms(loop, screen)
+        new = stars_ms(field.draw, screen)
+        print(f"{name:<11} {old:>9.3f} {new:>9.3f} {old / new:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark headless simulation throughput (ticks per second per core)
+
+First checks that seeded games end exactly as they did in run_game's
+original list-of-dicts loop, then times the simulation.
+
+Run from the pygame_shooter directory:
+    python -m benchmarks.bench_simulation
+"""
+import math
+import random
+import time
+import pygame
+from modules.config import WIDTH, HEIGHT, MODE_CONFIGS
+from modules.simulation import GameState, step, INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE
+
+TICKS = 20000
+# Seeded games per mode compared against the original loop
+CHECK_GAMES = 40
+
+def sweep_inputs(tick: int) -> int:
+    """Fire constantly while sweeping left and right once a second"""
+    return INPUT_FIRE | (INPUT_LEFT if (tick // 60) % 2 else INPUT_RIGHT)
+
+def random_inputs(seed: int):
+    """Endless seeded input masks: a direction and the fire button, held for a few ticks at a time"""
+    rng = random.Random(seed)
+    while True:
+        mask = rng.choice((0, INPUT_LEFT, INPUT_RIGHT)) | (INPUT_FIRE if rng.random() < 0.8 else 0)
+        for _ in range(rng.randint(1, 40)):
+            yield mask
+
+def original_game(mode: str, seed: int, inputs, max_ticks: int):
+    """(score, lives, ticks) of a game played by run_game's original list-of-dicts loop"""
+    cfg = MODE_CONFIGS[mode]
+    rng = random.Random(seed)
+    player = pygame.Rect(WIDTH // 2 - 25, HEIGHT - 70, 50, 40)
+    bullets = []
+    enemies = []
+    score = 0
+    lives = 3 if mode != "Hard" else 2
+    frame = last_shot = 0
+    running = True
+    while running and frame < max_ticks:
+        mask = next(inputs)
+        if mask & INPUT_FIRE and frame - last_shot > 10:
+            bullets.append(pygame.Rect(player.centerx - 3, player.top - 12, 6, 12))
+            last_shot = frame
+        if mask & INPUT_LEFT:
+            player.x -= cfg["player_speed"]
+        if mask & INPUT_RIGHT:
+            player.x += cfg["player_speed"]
+        player.x = max(10, min(WIDTH - player.width - 10, player.x))
+        if frame % cfg["spawn_rate"] == 0:
+            enemies.append({"x": rng.randint(20, WIDTH - 20), "y": -30, "speed": cfg["enemy_speed"], "size": 18})
+
+        for b in bullets:
+            b.y += cfg["bullet_speed"]
+        bullets = [b for b in bullets if b.bottom > 0]
+        for e in enemies:
+            e["y"] += e["speed"]
+            if cfg["enemy_shape"] in ("triangle", "asteroid"):
+                e["x"] += math.sin((frame + e["y"]) * 0.03) * (1 if cfg["enemy_shape"] == "triangle" else 2)
+        enemies = [e for e in enemies if e["y"] - e["size"] < HEIGHT]
+
+        to_remove_b = []
+        to_remove_e = []
+        for i, e in enumerate(enemies):
+            size = e["size"]
+            er = pygame.Rect(e["x"] - size, e["y"] - size, size * 2, size * 2)
+            for j, b in enumerate(bullets):
+                if er.colliderect(b):
+                    to_remove_b.append(j)
+                    to_remove_e.append(i)
+                    score += 10
+                    break
+            if er.colliderect(player):
+                to_remove_e.append(i)
+                lives -= 1
+                if lives <= 0:
+                    running = False
+                    break
+        for idx in sorted(set(to_remove_b), reverse=True):
+            bullets.pop(idx)
+        for idx in sorted(set(to_remove_e), reverse=True):
+            enemies.pop(idx)
+        frame += 1
+    return score, lives, frame
+
+def simulated_game(mode: str, seed: int, inputs, max_ticks: int):
+    """(score, lives, ticks) of the same game played by step()"""
+    state = GameState(mode, seed=seed)
+    while state.running and state.frame < max_ticks:
+        step(state, next(inputs))
+    return state.score, state.lives, state.frame
+
+def check(games: int = CHECK_GAMES, max_ticks: int = TICKS):
+    """Assert that seeded games end the same in step() as in the original loop"""
+    for mode in MODE_CONFIGS:
+        for seed in range(games):
+            expected = original_game(mode, seed, random_inputs(seed), max_ticks)
+            got = simulated_game(mode, seed, random_inputs(seed), max_ticks)
+            assert got == expected, f"{mode} seed {seed}: step() ended {got}, the original loop {expected}"
+    print(f"{games} seeded games per mode end as in the original loop")
+
+def main():
+    check()
+    print(f"{'mode':>8} {'ticks':>7} {'games':>6} {'ticks/s':>10}")
+    for mode in MODE_CONFIGS:
+        ticks = games = 0
+        t0 = time.perf_counter()
+        while ticks < TICKS:
+            state = GameState(mode, seed=games)
+            games += 1
+            while state.running and ticks < TICKS:
+                step(state, sweep_inputs(state.frame))
+                ticks += 1
+        elapsed = time.perf_counter() - t0
+        print(f"{mode:>8} {ticks:>7} {games:>6} {ticks / elapsed:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark score inserts and leaderboard queries before and after SQLite tuning
+
+"before" opens a fresh default connection (or ORM session) per call, as the
+helpers used to; "after" goes through modules.storage: reused connections,
+WAL, synchronous=NORMAL, a larger page cache, mmap and cached statements.
+
+Run from the pygame_shooter directory:
+    python -m benchmarks.bench_storage
+"""
+import os
+import sqlite3
+import tempfile
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from modules import storage
+from modules.database import Base, Score, _leaderboard_query
+
+INSERTS = 2000
+QUERIES = 2000
+
+CREATE = """CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, player TEXT NOT NULL, score INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"""
+INDEX = "CREATE INDEX IF NOT EXISTS ix_scores_score ON scores (score DESC, created_at)"
+INSERT = "INSERT INTO scores (player, score) VALUES (?, ?)"
+TOP = "SELECT player, score, created_at FROM scores ORDER BY score DESC, created_at ASC LIMIT ?"
+
+def rate(fn, n):
+    """Calls per second of fn(i) over n calls"""
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return n / (time.perf_counter() - t0)
+
+def sqlite_before(path):
+    """Connect, execute, commit and close on every call"""
+    def insert(i):
+        conn = sqlite3.connect(path)
+        conn.execute(INSERT, ("p", i))
+        conn.commit()
+        conn.close()
+    def query(i):
+        conn = sqlite3.connect(path)
+        conn.execute(TOP, (20,)).fetchall()
+        conn.close()
+    return insert, query
+
+def sqlite_after(path):
+    """One tuned connection per thread with cached statements, plus the leaderboard index"""
+    with storage.connect(path) as conn:
+        conn.execute(INDEX)
+    def insert(i):
+        conn = storage.connect(path)
+        with conn:
+            conn.execute(INSERT, ("p", i))
+    def query(i):
+        storage.connect(path).execute(TOP, (20,)).fetchall()
+    return insert, query
+
+def orm_before(path):
+    """Default engine, one ORM session per call"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    def insert(i):
+        session = Session()
+        session.add(Score(player="p", mode="Easy", score=i, duration_sec=1.0, played_at="2024-01-01T00:00:00"))
+        session.commit()
+        session.close()
+    def query(i):
+        session = Session()
+        session.query(Score).order_by(Score.score.desc()).limit(20).all()
+        session.close()
+    return insert, query
+
+def core_after(path):
+    """Tuned pooled engine with Core statements, as modules.database now uses"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"cached_statements": storage.STATEMENT_CACHE})
+    event.listen(engine, "connect", lambda dbapi_conn, record: storage.apply_pragmas(dbapi_conn))
+    Base.metadata.create_all(engine)
+    stmt = Score.__table__.insert()
+    top = _leaderboard_query().limit(20)
+    def insert(i):
+        with engine.begin() as conn:
+            conn.execute(stmt, {"player": "p", "mode": "Easy", "score": i, "duration_sec": 1.0,
+                                "played_at": "2024-01-01T00:00:00"})
+    def query(i):
+        with engine.connect() as conn:
+            conn.execute(top).all()
+    return insert, query
+
+def main():
+    print(f"{'path':<22} {'inserts/s':>10} {'queries/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, setup, sql in (
+            ("sqlite3 before", sqlite_before, True),
+            ("sqlite3 after", sqlite_after, True),
+            ("sqlalchemy before", orm_before, False),
+            ("sqlalchemy after", core_after, False),
+        ):
+            path = os.path.join(tmp, name.replace(" ", "_") + ".db")
+            if sql:
+                with sqlite3.connect(path) as conn:
+                    conn.execute(CREATE)
+            insert, query = setup(path)
+            ins = rate(insert, INSERTS)
+            qry = rate(query, QUERIES)
+            print(f"{name:<22} {ins:>10.0f} {qry:>10.0f}")
+        storage.close()
+
+if __name__ == "__main__":
+    main()
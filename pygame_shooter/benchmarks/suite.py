@@ -0,0 +1,298 @@
+"""
+Benchmark suite for the simulation, rendering and storage hot paths
+
+Every case is timed at several sizes (entity counts or table rows) on a
+dummy SDL display, and the results are saved as JSON keyed by the current
+commit so runs can be compared across commits.
+
+Run from the pygame_shooter directory:
+    python -m benchmarks.suite --out bench/HEAD.json
+    python -m benchmarks.suite --quick --only sim --compare bench/base.json
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Asset paths in MODE_CONFIGS are relative to the modules directory
+MODULES_DIR = os.path.join(PACKAGE_DIR, "modules")
+
+CASES = {}
+# Callbacks run (last first) once a case size is timed, e.g. to remove scratch files
+CLEANUP = []
+
+def case(name: str, sizes, quick=None):
+    """Register setup(size) -> fn; fn() is one timed call of the hot path"""
+    def register(setup):
+        CASES[name] = (setup, tuple(sizes), tuple(quick or sizes[:2]))
+        return setup
+    return register
+
+def measure(fn, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """Per-call times in microseconds over `repeat` batches sized to last about min_time/repeat each"""
+    fn()
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time / repeat or n >= 1 << 20:
+            break
+        n *= 2
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        samples.append((time.perf_counter() - t0) / n * 1e6)
+    return {"median_us": statistics.median(samples), "min_us": min(samples),
+            "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0, "calls": n * repeat}
+
+# --- Simulation ---
+
+def _busy_state(count: int, mode: str = "Hard"):
+    """A running game with `count` enemies and as many bullets spread over the field"""
+    from modules.config import WIDTH, HEIGHT
+    from modules.simulation import GameState
+    rng = random.Random(count)
+    state = GameState(mode, seed=count)
+    state.lives = 10 ** 9
+    for _ in range(count):
+        state.enemies.spawn(rng.randint(20, WIDTH - 20), rng.randint(-30, HEIGHT - 200), 0, state.cfg["enemy_shape"], 18)
+        state.bullets.spawn(rng.randint(0, WIDTH - 6), rng.randint(0, HEIGHT))
+    return state
+
+@case("sim.step", sizes=(10, 100, 1000, 5000))
+def bench_step(count):
+    """One full simulation tick (spawn, move, collide) with `count` enemies and bullets"""
+    from modules.config import WIDTH, HEIGHT
+    from modules.simulation import step, INPUT_FIRE
+    state = _busy_state(count)
+    enemies, bullets = state.enemies, state.bullets
+    shape = state.cfg["enemy_shape"]
+    rng = random.Random(0)
+
+    def tick():
+        step(state, INPUT_FIRE)
+        # Replace what was shot or left the screen so the load stays at `count`
+        for _ in range(count - enemies.count):
+            enemies.spawn(rng.randint(20, WIDTH - 20), rng.randint(-30, HEIGHT - 200), 0, shape, 18)
+        for _ in range(count - bullets.count):
+            bullets.spawn(rng.randint(0, WIDTH - 6), rng.randint(0, HEIGHT))
+    return tick
+
+@case("sim.spawn_move", sizes=(100, 1000, 10000))
+def bench_spawn_move(count):
+    """Move and cull `count` enemies, respawning those that left the screen"""
+    from modules.config import HEIGHT, MODE_CONFIGS
+    from modules.entities import EnemyPool
+    from modules.simulation import spawn_enemy
+    rng = random.Random(0)
+    cfg = MODE_CONFIGS["Hard"]
+    pool = EnemyPool(count)
+    for _ in range(count):
+        spawn_enemy(cfg, pool, rng)
+    frame = [0]
+
+    def tick():
+        pool.move(frame[0], HEIGHT)
+        for _ in range(count - pool.count):
+            spawn_enemy(cfg, pool, rng)
+        frame[0] += 1
+    return tick
+
+@case("sim.collision", sizes=(100, 1000, 10000))
+def bench_collision(count):
+    """Spatial-hash broadphase over `count` boxes, half enemies and half bullets"""
+    from benchmarks.bench_collision import make_scene
+    from modules.collision import SpatialHash, find_hits
+    enemies, bullets = make_scene(count)
+    grid = SpatialHash()
+    return lambda: find_hits(enemies, bullets, grid=grid)
+
+# --- Rendering ---
+
+_display = None
+
+def _screen():
+    global _display
+    import pygame
+    if _display is None:
+        from modules.config import WIDTH, HEIGHT
+        pygame.display.init()
+        pygame.font.init()
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            pass  # Sound effects then load as None, as in the game
+        _display = pygame.display.set_mode((WIDTH, HEIGHT))
+    return _display
+
+@case("render.background", sizes=(1,), quick=(1,))
+def bench_background(_):
+    """draw_background for one frame of the Hard mode scroll"""
+    from modules.config import MODE_CONFIGS
+    from modules.game import draw_background
+    from modules.assets import load_assets
+    screen = _screen()
+    cfg = dict(MODE_CONFIGS["Hard"], mode="Hard")
+    assets = load_assets("Hard")
+    frame = [0]
+
+    def draw():
+        draw_background(screen, cfg, assets, frame[0])
+        frame[0] += 1
+    return draw
+
+@case("render.frame", sizes=(10, 100, 500, 2000))
+def bench_draw_game(count):
+    """draw_game (background, sprites, HUD) with `count` enemies and bullets on screen"""
+    import pygame
+    from modules.config import MODE_CONFIGS
+    from modules.game import draw_game, HUD_COLOR
+    from modules.assets import load_assets
+    from modules.render import FullRenderer, SpriteBatch
+    from modules.textcache import GlyphAtlas
+    screen = _screen()
+    MODE_CONFIGS["Hard"]["mode"] = "Hard"
+    assets = load_assets("Hard")
+    font = pygame.font.SysFont("arial", 20)
+    digits = GlyphAtlas(font, HUD_COLOR)
+    canvas = FullRenderer(screen)
+    state = _busy_state(count)
+    batch = SpriteBatch()
+    return lambda: draw_game(canvas, state, assets, font, digits, 0.5, batch=batch)
+
+@case("assets.load", sizes=(1,), quick=(1,))
+def bench_load_assets(_):
+    """Load one mode's assets into a fresh AssetManager (reads the bake cache)"""
+    _screen()
+    from modules.assets import AssetManager
+    return lambda: AssetManager().for_mode("Hard")
+
+# --- Storage ---
+
+def _scratch_db(rows: int):
+    """Point modules.database at a fresh file holding `rows` scores, removed after the case"""
+    from sqlalchemy import create_engine, event
+    from modules import database, storage
+    scratch = tempfile.TemporaryDirectory(prefix="bench_db_")
+    CLEANUP.append(scratch.cleanup)
+    path = os.path.join(scratch.name, "scores.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"cached_statements": storage.STATEMENT_CACHE})
+    CLEANUP.append(engine.dispose)
+    event.listen(engine, "connect", lambda dbapi_conn, record: storage.apply_pragmas(dbapi_conn))
+    database.engine = engine
+    database.Base.metadata.create_all(engine)
+    rng = random.Random(rows)
+    database.db_import_rows((f"p{i % 200}", database.MODES[i % 3], rng.randint(0, 20000), 60.0,
+                             f"2024-01-01T{i:08d}") for i in range(rows))
+    return database
+
+@case("db.add_score", sizes=(1000, 100000), quick=(1000,))
+def bench_add_score(rows):
+    """db_add_score into a table of `rows` scores (one transaction, stats update included)"""
+    database = _scratch_db(rows)
+    rng = random.Random(1)
+    return lambda: database.db_add_score("bench", "Hard", rng.randint(0, 20000), 60.0, "2025-01-01T00:00:00")
+
+@case("db.get_scores", sizes=(100, 1000, 10000), quick=(100, 1000))
+def bench_get_scores(rows):
+    """db_get_scores("Hard"): the full leaderboard of one mode out of `rows` scores"""
+    database = _scratch_db(rows)
+    return lambda: database.db_get_scores("Hard")
+
+@case("db.top_scores", sizes=(1000, 100000), quick=(1000,))
+def bench_top_scores(rows):
+    """db_top_scores(20, "Hard") out of `rows` scores"""
+    database = _scratch_db(rows)
+    return lambda: database.db_top_scores(20, "Hard")
+
+# --- Runner ---
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PACKAGE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run(names, quick: bool = False, min_time: float = 0.2) -> dict:
+    results = {}
+    for name in names:
+        setup, sizes, quick_sizes = CASES[name]
+        results[name] = {}
+        for size in quick_sizes if quick else sizes:
+            try:
+                stats = measure(setup(size), min_time)
+            finally:
+                while CLEANUP:
+                    CLEANUP.pop()()
+            results[name][str(size)] = stats
+            print(f"{name:<18} {size:>7} {stats['median_us']:>12.1f} us  (min {stats['min_us']:.1f}, "
+                  f"{stats['calls']} calls)", flush=True)
+    return results
+
+def compare(old: dict, new: dict, threshold: float = 0.10):
+    """Print new/old median ratios; return the (case, size) pairs slower by more than threshold"""
+    slower = []
+    print(f"\n{'case':<18} {'size':>7} {'old us':>12} {'new us':>12} {'ratio':>7}")
+    for name, sizes in new["results"].items():
+        for size, stats in sizes.items():
+            before = old["results"].get(name, {}).get(size)
+            if not before:
+                continue
+            ratio = stats["median_us"] / before["median_us"]
+            flag = "  slower" if ratio > 1 + threshold else ""
+            print(f"{name:<18} {size:>7} {before['median_us']:>12.1f} {stats['median_us']:>12.1f} {ratio:>6.2f}x{flag}")
+            if flag:
+                slower.append((name, size))
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the game's hot paths and save the results as JSON")
+    parser.add_argument("--out", default=None, help="JSON output (default: bench/<commit>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    parser.add_argument("--only", action="append", metavar="PREFIX", help="run cases starting with PREFIX (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes only")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds of timing per case and size")
+    args = parser.parse_args(argv)
+
+    names = [n for n in CASES if not args.only or any(n.startswith(p) for p in args.only)]
+    commit = git_commit()
+    out = os.path.abspath(args.out or os.path.join(PACKAGE_DIR, "bench", f"{commit}.json"))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    sys.path.insert(0, PACKAGE_DIR)
+    os.chdir(MODULES_DIR)
+    report = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "results": run(names, args.quick, args.min_time),
+    }
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results: {out}")
+    if baseline and compare(baseline, report):
+        parser.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,50 @@
 """
 Main entry point for PyGame Shooter
+
+Startup loads only what the launcher's first frame needs. The database is
+opened on a background thread once the launcher is on screen, Tkinter is
+imported with the scoreboard and the mixer is started by the game. Check
+the import cost against the budget with:
+    python -m modules.startup
 """
+import time
+START = time.perf_counter()
+
+import threading
 import pygame
-from modules.database import db_init
-from modules.ui import launcher_menu
+from modules.launcher import launcher_menu
 from modules.config import WIDTH, HEIGHT
 
+def open_storage():
+    """Create or migrate the database, replay the score journal and fill the leaderboard and stats caches"""
+    from modules.database import db_init
+    from modules.leaderboard import LEADERBOARD, STATS
+    db_init()
+    LEADERBOARD.warm()
+    STATS.warm()
+
 def main():
     """Initialize and run the game"""
-    db_init()
-    pygame.init()
+    storage = threading.Thread(target=open_storage, name="storage-init")
+    # The launcher needs no mixer, joystick or other subsystems
+    pygame.display.init()
+    pygame.font.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Space Shooter — Choose Mode")
     clock = pygame.time.Clock()
     bigfont = pygame.font.SysFont("arial", 36, bold=True)
 
-    chosen = launcher_menu(screen, clock, bigfont)
+    def shown():
+        print(f"Launcher first frame: {(time.perf_counter() - START) * 1000:.1f} ms after start")
+        storage.start()
+
+    chosen = launcher_menu(screen, clock, bigfont, on_shown=shown)
     pygame.display.quit()
-    
+    if storage.ident is None:
+        storage.start()
+    # The game saves its score when it ends, so the tables must be ready
+    storage.join()
+
     from modules.game import run_game
     run_game(chosen)
 
@@ -0,0 +1,138 @@
+"""
+On-disk cache of pre-scaled image pixels and pre-decoded sound samples
+
+Baked images are raw RGBA/RGB buffers named after the source file's path,
+mtime and size plus the target size, so editing a PNG (or changing a target
+size) simply misses the old entry without reading the PNG to find out.
+Baked sounds are raw PCM in the mixer's format, named after the same source
+key and that format, so loading one skips the MP3/WAV decode. Bake everything ahead of time with:
+    python -m modules.assetcache
+"""
+import hashlib
+import mmap
+import os
+import pygame
+from modules.config import ASSET_CACHE_DIR
+
+def _digest(path: str) -> str:
+    """Cache key for a source file from its stat, so a hit never reads the source"""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}"
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+def _write(baked: str, data: bytes, path: str):
+    """Atomically write a cache entry; a failure only costs the next load a decode"""
+    try:
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        tmp = f"{baked}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, baked)
+    except OSError as e:
+        print(f"Could not write asset cache for {path}: {e}")
+
+def cache_file(path: str, size, fmt: str) -> str:
+    """Cache location for a source image scaled to size in pixel format fmt"""
+    return os.path.join(ASSET_CACHE_DIR, f"{_digest(path)}_{size[0]}x{size[1]}_{fmt}.raw")
+
+def load_baked(baked: str, size, fmt: str):
+    """Map a baked buffer straight into a Surface, or None if it is missing or truncated"""
+    try:
+        with open(baked, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    if len(buf) != size[0] * size[1] * len(fmt):
+        buf.close()
+        return None
+    # The surface keeps the mapping alive for as long as it is referenced
+    return pygame.image.frombuffer(buf, size, fmt)
+
+def bake(path: str, size, fmt: str, baked: str = None):
+    """Decode and scale a source image, write its pixels to the cache and return it"""
+    surf = pygame.transform.scale(pygame.image.load(path), size)
+    _write(baked or cache_file(path, size, fmt), pygame.image.tobytes(surf, fmt), path)
+    return surf
+
+def load_image(path: str, size, alpha: bool = True):
+    """Load a scaled image from the bake cache, baking it on a miss"""
+    fmt = "RGBA" if alpha else "RGB"
+    baked = cache_file(path, size, fmt)
+    surf = load_baked(baked, size, fmt)
+    return surf if surf is not None else bake(path, size, fmt, baked)
+
+def sound_cache_file(path: str, mixer_format) -> str:
+    """Cache location for a sound decoded to the mixer's (frequency, size, channels)"""
+    freq, size, channels = mixer_format
+    return os.path.join(ASSET_CACHE_DIR, f"{_digest(path)}_{freq}_{size}_{channels}.pcm")
+
+def bake_sound(path: str, baked: str = None):
+    """Decode a sound, write its PCM samples to the cache and return it"""
+    sound = pygame.mixer.Sound(path)
+    _write(baked or sound_cache_file(path, pygame.mixer.get_init()), sound.get_raw(), path)
+    return sound
+
+def load_sound(path: str):
+    """Load a sound from its pre-decoded PCM, decoding and baking it on a miss.
+
+    Needs an initialized mixer; raises like pygame.mixer.Sound(path) does.
+    """
+    mixer_format = pygame.mixer.get_init()
+    if not mixer_format:
+        raise pygame.error("mixer not initialized")
+    baked = sound_cache_file(path, mixer_format)
+    freq, size, channels = mixer_format
+    try:
+        with open(baked, "rb") as f:
+            data = f.read()
+    except OSError:
+        data = b""
+    if data and len(data) % (abs(size) // 8 * channels) == 0:
+        return pygame.mixer.Sound(buffer=data)
+    return bake_sound(path, baked)
+
+def bake_all(specs, sounds=()):
+    """Bake every (path, size, alpha) image spec and sound path; delete cache files none of them use.
+
+    Sounds are only baked while the mixer is initialized, in its format.
+    """
+    keep = set()
+    mixer_format = pygame.mixer.get_init()
+    for path in sounds if mixer_format else ():
+        try:
+            baked = sound_cache_file(path, mixer_format)
+        except OSError as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        keep.add(os.path.basename(baked))
+        if not os.path.exists(baked):
+            bake_sound(path, baked)
+            print(f"Baked {path} -> {os.path.basename(baked)}")
+    for path, size, alpha in specs:
+        fmt = "RGBA" if alpha else "RGB"
+        try:
+            baked = cache_file(path, size, fmt)
+        except OSError as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        keep.add(os.path.basename(baked))
+        if not os.path.exists(baked):
+            bake(path, size, fmt, baked)
+            print(f"Baked {path} -> {os.path.basename(baked)}")
+    if os.path.isdir(ASSET_CACHE_DIR):
+        for name in os.listdir(ASSET_CACHE_DIR):
+            # Without a mixer the sounds were not checked, so leave their PCM alone
+            if name not in keep and (mixer_format or not name.endswith(".pcm")):
+                os.remove(os.path.join(ASSET_CACHE_DIR, name))
+                print(f"Removed stale {name}")
+
+def main():
+    from modules.assets import image_specs, SOUND_FILES
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"No audio device, sounds not baked: {e}")
+    bake_all(image_specs(), SOUND_FILES.values())
+
+if __name__ == "__main__":
+    main()
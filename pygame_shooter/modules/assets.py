@@ -1,77 +1,130 @@
 """
 Asset loading and management
 """
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 from modules.config import MODE_CONFIGS, WIDTH, HEIGHT
+from modules import assetcache
+from modules.background import ScrollingBackground
 
-def load_assets():
-    """Load all game assets"""
-    assets = {
-        "player": None,
-        "bullet": None,
-        "enemies": {
-            "circle": None,
-            "triangle": None,
-            "asteroid": None,
-        },
-        "backgrounds": {
-            "Easy": None,
-            "Medium": None,
-            "Hard": None,
-        },
-        "sounds": {
-            "shoot": None,
-            "hit": None,
-            "explode": None,
-        },
-        "music": {
-            "Easy": MODE_CONFIGS["Easy"]["music"],
-            "Medium": MODE_CONFIGS["Medium"]["music"],
-            "Hard": MODE_CONFIGS["Hard"]["music"],
-        },
-    }
-    
-    try:
-        # Load player image
-        assets["player"] = pygame.image.load("../media/player.png").convert_alpha()
-        assets["player"] = pygame.transform.scale(assets["player"], (80, 60))
-        
-        # Load bullet image
-        assets["bullet"] = pygame.image.load("../media/bullet.png").convert_alpha()
-        assets["bullet"] = pygame.transform.scale(assets["bullet"], (24, 48))
-    except (pygame.error, FileNotFoundError) as e:
-        print(f"Error loading player/bullet images: {e}")
-    
-    # Load enemy images
-    for shape in assets["enemies"]:
-        try:
-            img = pygame.image.load(f"../media/enemy_{shape}.png").convert_alpha()
-            assets["enemies"][shape] = pygame.transform.scale(img, (50, 50))
-        except (pygame.error, FileNotFoundError) as e:
-            print(f"Error loading enemy image {shape}: {e}")
-    
-    # Load backgrounds
-    for mode in assets["backgrounds"]:
-        try:
-            bg = pygame.image.load(MODE_CONFIGS[mode]["bg_image"]).convert()
-            assets["backgrounds"][mode] = pygame.transform.scale(bg, (WIDTH * 2, HEIGHT))
-        except (pygame.error, FileNotFoundError) as e:
-            print(f"Error loading background for {mode}: {e}")
-    
-    # Load sounds
-    try:
-        assets["sounds"]["shoot"] = pygame.mixer.Sound("../media/shoot.wav")
-    except (pygame.error, FileNotFoundError) as e:
-        print(f"Error loading shoot sound: {e}")
-    
+SHAPE_FILES = {shape: f"../media/enemy_{shape}.png" for shape in ("circle", "triangle", "asteroid")}
+SOUND_FILES = {
+    "shoot": "../media/shoot.wav",
+    "hit": "../media/hit.wav",
+    "explode": "../media/explode.wav",
+}
+
+def _load_image(path, size, alpha):
+    """Load a scaled image via the bake cache (no display needed, safe off the main thread)"""
     try:
-        assets["sounds"]["hit"] = pygame.mixer.Sound("../media/hit.wav")
+        return assetcache.load_image(path, size, alpha)
     except (pygame.error, FileNotFoundError) as e:
-        print(f"Error loading hit sound: {e}")
-    
+        print(f"Error loading image {path}: {e}")
+        return None
+
+def image_specs(modes=MODE_CONFIGS):
+    """(path, size, alpha) for the shared images plus those of the given modes"""
+    specs = [("../media/player.png", (80, 60), True), ("../media/bullet.png", (24, 48), True)]
+    for m in modes:
+        specs.append((SHAPE_FILES[MODE_CONFIGS[m]["enemy_shape"]], (50, 50), True))
+        specs.append((MODE_CONFIGS[m]["bg_image"], (WIDTH, HEIGHT), False))
+        specs.extend((path, (WIDTH, HEIGHT), True) for path, _ in MODE_CONFIGS[m].get("bg_layers", ()))
+    return specs
+
+def _load_sound(path):
+    """Load a sound effect from its pre-decoded PCM (decoding and baking it on a miss)"""
     try:
-        assets["sounds"]["explode"] = pygame.mixer.Sound("../media/explode.wav")
+        return assetcache.load_sound(path)
     except (pygame.error, FileNotFoundError) as e:
-        print(f"Error loading explode sound: {e}")
-        
-    return assets
+        print(f"Error loading sound {path}: {e}")
+        return None
+
+class AssetManager:
+    """Process-wide asset cache: loads on demand, memoizes, preloads in the background.
+
+    Loads (from the bake cache, or decode and scale) run on a single worker
+    thread and are memoized per (path, size), so a request either starts the
+    load, joins a preload that is already running, or returns the finished
+    result. Conversion to the display format happens on the calling thread,
+    once per asset.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = {}
+        self._converted = {}
+
+    def _submit(self, key, fn, *args):
+        with self._lock:
+            fut = self._futures.get(key)
+            if fut is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+                fut = self._executor.submit(fn, *args)
+                self._futures[key] = fut
+        return fut
+
+    def image(self, path: str, size, alpha: bool = True):
+        """Get a scaled, display-converted image, or None if it failed to load"""
+        key = ("image", path, size)
+        if key in self._converted:
+            return self._converted[key]
+        surf = self._submit(key, _load_image, path, size, alpha).result()
+        if surf is not None:
+            try:
+                surf = surf.convert_alpha() if alpha else surf.convert()
+            except pygame.error:
+                pass  # No display yet; keep the unconverted surface
+        self._converted[key] = surf
+        return surf
+
+    def sound(self, name: str):
+        """Get a sound effect by name, or None if it failed to load"""
+        path = SOUND_FILES[name]
+        return self._submit(("sound", path), _load_sound, path).result()
+
+    def player(self):
+        return self.image("../media/player.png", (80, 60))
+
+    def bullet(self):
+        return self.image("../media/bullet.png", (24, 48))
+
+    def enemy(self, shape: str):
+        return self.image(SHAPE_FILES[shape], (50, 50))
+
+    def background(self, mode: str):
+        """A mode's scrolling background: its bg_image tile plus any bg_layers over it"""
+        cfg = MODE_CONFIGS[mode]
+        layers = [(self.image(cfg["bg_image"], (WIDTH, HEIGHT), alpha=False), 1.0)]
+        layers += [(self.image(path, (WIDTH, HEIGHT)), speed) for path, speed in cfg.get("bg_layers", ())]
+        return ScrollingBackground(layers)
+
+    def preload(self, mode: str = None):
+        """Start decoding the shared assets (and one mode's) on the worker thread"""
+        for path, size, alpha in image_specs([mode] if mode in MODE_CONFIGS else []):
+            self._submit(("image", path, size), _load_image, path, size, alpha)
+        if pygame.mixer.get_init():
+            for path in SOUND_FILES.values():
+                self._submit(("sound", path), _load_sound, path)
+
+    def for_mode(self, mode: str = None):
+        """Build the assets dict used by the game, loading only what `mode` needs"""
+        modes = [mode] if mode in MODE_CONFIGS else list(MODE_CONFIGS)
+        shapes = {MODE_CONFIGS[m]["enemy_shape"] for m in modes}
+        return {
+            "player": self.player(),
+            "bullet": self.bullet(),
+            "enemies": {shape: self.enemy(shape) if shape in shapes else None for shape in SHAPE_FILES},
+            "backgrounds": {m: self.background(m) if m in modes else None for m in MODE_CONFIGS},
+            "sounds": {name: self.sound(name) for name in SOUND_FILES},
+            "music": {m: MODE_CONFIGS[m]["music"] for m in MODE_CONFIGS},
+        }
+
+# Shared by every run_game call in the process
+ASSETS = AssetManager()
+
+def load_assets(mode_name: str = None):
+    """Load game assets, for one mode or (by default) all of them"""
+    return ASSETS.for_mode(mode_name)
@@ -0,0 +1,118 @@
+"""
+Sound effect playback: channel groups per category, priority voice limits, same-frame dedupe
+"""
+import pygame
+from modules.config import SOUND_GROUPS, SOUND_PRIORITIES
+
+UNKNOWN = (float("-inf"), 0)
+
+class AudioManager:
+    """Plays registered sounds on mixer channels reserved per category.
+
+    play() only queues a sound for the frame, so a sound triggered many
+    times in one frame (five explosions on one tick, or across the ticks
+    of a frame) starts once. flush() starts the queued sounds, highest
+    priority first, each on a free channel of its category's group. When
+    the group is full, the sound takes over the voice of the
+    lowest-priority, oldest sound playing there if that is not above its
+    own priority; otherwise it is dropped. Voices are therefore bounded
+    by the group sizes however heavy the fire.
+    """
+
+    def __init__(self, groups=SOUND_GROUPS):
+        self.groups = dict(groups)
+        self.sounds = {}      # name -> (Sound, category, priority)
+        self.channels = {}    # category -> [Channel]
+        self.voices = {}      # channel id -> (priority, frame started)
+        self.mixer = None     # mixer.get_init() the channels were reserved under
+        self.pending = {}     # names queued this frame, in trigger order
+        self.frame = 0
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+
+    def init(self) -> bool:
+        """Start the mixer if needed and reserve the channel groups; False (sounds stay silent) without audio"""
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error as e:
+                print(f"No audio: {e}")
+                return False
+        if self._sync():
+            total = sum(self.groups.values())
+            pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+            # Reserved channels are never picked by Sound.play() or find_channel()
+            pygame.mixer.set_reserved(total)
+            first = 0
+            for category, n in self.groups.items():
+                self.channels[category] = [pygame.mixer.Channel(i) for i in range(first, first + n)]
+                first += n
+        return True
+
+    def _sync(self) -> bool:
+        """Forget the channels if the mixer was quit or re-initialized since they were reserved; True if they need reserving"""
+        mixer = pygame.mixer.get_init()
+        if mixer != self.mixer:
+            self.channels = {}
+            self.voices = {}
+            self.mixer = mixer
+        return bool(mixer) and not self.channels
+
+    def register(self, name: str, sound, category: str, priority: int = 0):
+        """Make a sound playable by name; a None sound (failed to load) is ignored"""
+        if category not in self.groups:
+            raise ValueError(f"Unknown sound category {category!r}")
+        if sound is not None:
+            self.sounds[name] = (sound, category, priority)
+
+    def load(self, sounds: dict, priorities=SOUND_PRIORITIES):
+        """Register a name -> Sound dict using each name's (category, priority)"""
+        for name, sound in sounds.items():
+            self.register(name, sound, *priorities[name])
+
+    def play(self, name: str):
+        """Queue a sound for this frame's flush()"""
+        if name in self.sounds:
+            self.pending[name] = None
+
+    def flush(self):
+        """Start this frame's queued sounds"""
+        self.frame += 1
+        if not self.pending:
+            return
+        if self._sync():
+            self.init()
+        if self.channels:
+            for name in sorted(self.pending, key=lambda n: -self.sounds[n][2]):
+                self._start(*self.sounds[name])
+        self.pending.clear()
+
+    def _start(self, sound, category, priority):
+        voices = self.voices
+        victim = None
+        for chan in self.channels[category]:
+            if not chan.get_busy():
+                victim = chan
+                break
+            # A channel started outside the manager counts as the oldest, lowest voice
+            if victim is None or voices.get(id(chan), UNKNOWN) < voices.get(id(victim), UNKNOWN):
+                victim = chan
+        else:
+            if voices.get(id(victim), UNKNOWN)[0] > priority:
+                self.dropped += 1
+                return
+            self.stolen += 1
+        victim.play(sound)
+        self.played += 1
+        voices[id(victim)] = (priority, self.frame)
+
+    def stop(self):
+        """Silence every group and forget anything queued"""
+        for channels in self.channels.values():
+            for chan in channels:
+                chan.stop()
+        self.pending.clear()
+
+# Shared by every run_game call in the process
+AUDIO = AudioManager()
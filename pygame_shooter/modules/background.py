@@ -0,0 +1,34 @@
+"""
+Wrap-around scrolling backgrounds built from screen-sized tiles
+"""
+from modules.config import WIDTH, HEIGHT
+
+class ScrollingBackground:
+    """Parallax layers, each a screen-sized tile scrolled left at its own speed.
+
+    A layer is drawn as two blits of the tile, split at the scroll offset,
+    that together cover the screen exactly once, so an opaque layer costs
+    the fill of one full-screen blit. Layers are drawn back to front: the
+    first should be opaque, later ones per-pixel alpha.
+    """
+
+    def __init__(self, layers, size=(WIDTH, HEIGHT)):
+        # (tile, pixels scrolled per frame)
+        self.layers = [(tile, speed) for tile, speed in layers if tile is not None]
+        self.width, self.height = size
+
+    def __bool__(self):
+        return bool(self.layers)
+
+    def draw(self, screen, scroll: float):
+        """Draw every layer scrolled by `scroll` frames"""
+        w, h = self.width, self.height
+        for tile, speed in self.layers:
+            offset = int(scroll * speed) % w
+            screen.blit(tile, (0, 0), (offset, 0, w - offset, h))
+            if offset:
+                screen.blit(tile, (w - offset, 0), (0, 0, offset, h))
+
+    def nbytes(self) -> int:
+        """Pixel memory held by the layer tiles"""
+        return sum(tile.get_bytesize() * tile.get_width() * tile.get_height() for tile, _ in self.layers)
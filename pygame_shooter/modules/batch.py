@@ -0,0 +1,195 @@
+"""
+Batch simulator for balancing MODE_CONFIGS across parameter grids
+
+Runs headless games with a scripted bot over a process pool and streams
+one CSV row per game, plus a per-grid-point summary at the end.
+
+Run from the pygame_shooter directory, e.g.:
+    python -m modules.batch --mode Hard --grid spawn_rate=12,18,24 \\
+        --grid enemy_speed=3,4,5 --seeds 1000 --out sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from modules.config import FPS, MODE_CONFIGS
+from modules.simulation import GameState, step, INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, PLAYER_W
+
+TUNABLE = ("spawn_rate", "enemy_speed", "bullet_speed", "player_speed")
+# Sign each tunable must have: spawn_rate is a tick interval (0 divides by
+# zero), bullets travel up the screen, everything else moves down or sideways
+SIGNS = {"spawn_rate": 1, "enemy_speed": 1, "bullet_speed": -1, "player_speed": 1}
+MAX_TICKS = FPS * 600
+GAME_FIELDS = ("point", "seed", "score", "survival_sec", "hit_rate", "ticks")
+METRICS = {"score": 10, "survival_sec": 1.0, "hit_rate": 0.01}
+
+def bot_policy(state) -> int:
+    """Always fire and steer under the lowest enemy on screen"""
+    enemies = state.enemies
+    target = -1
+    lowest = float("-inf")
+    for s in enemies.slots():
+        if enemies.y[s] > lowest:
+            lowest = enemies.y[s]
+            target = s
+    inputs = INPUT_FIRE
+    if target >= 0:
+        center = state.player_x + PLAYER_W // 2
+        tx = enemies.x[target]
+        if tx < center - 4:
+            inputs |= INPUT_LEFT
+        elif tx > center + 4:
+            inputs |= INPUT_RIGHT
+    return inputs
+
+def play(mode: str, overrides: dict, seed: int, max_ticks: int = MAX_TICKS):
+    """Play one bot game and return (seed, score, survival_sec, hit_rate, ticks)"""
+    state = GameState(mode, seed, overrides)
+    while state.running and state.frame < max_ticks:
+        step(state, bot_policy(state))
+    hit_rate = state.kills / state.shots if state.shots else 0.0
+    return (seed, state.score, state.duration_sec, hit_rate, state.frame)
+
+def run_chunk(task):
+    """Worker entry point: play a run of seeds for one grid point"""
+    point, mode, overrides, first_seed, count, max_ticks = task
+    return point, [play(mode, overrides, seed, max_ticks) for seed in range(first_seed, first_seed + count)]
+
+class Distribution:
+    """Streaming count/mean/min/max with a fixed-width histogram for quantiles"""
+
+    def __init__(self, bucket: float):
+        self.bucket = bucket
+        self.count = 0
+        self.total = 0.0
+        self.low = float("inf")
+        self.high = float("-inf")
+        self.buckets = {}
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+        key = int(value // self.bucket)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile, reported as the upper edge of its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                return min((key + 1) * self.bucket, self.high)
+        return self.high
+
+def parse_grid(specs):
+    """Turn ["spawn_rate=12,18", ...] into a list of override dicts (cartesian product)"""
+    axes = []
+    for spec in specs or []:
+        name, _, values = spec.partition("=")
+        name = name.strip()
+        if name not in TUNABLE:
+            raise argparse.ArgumentTypeError(f"Unknown parameter {name!r}; expected one of {', '.join(TUNABLE)}")
+        axis = []
+        for v in values.split(","):
+            if not v.strip():
+                continue
+            value = int(v)
+            if value * SIGNS[name] <= 0:
+                raise argparse.ArgumentTypeError(
+                    f"{name} must be {'positive' if SIGNS[name] > 0 else 'negative'}, got {value}")
+            axis.append((name, value))
+        if not axis:
+            raise argparse.ArgumentTypeError(f"{name} needs at least one value, got {spec!r}")
+        axes.append(axis)
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+def iter_tasks(mode, points, seeds, chunk, max_ticks):
+    """Yield worker tasks lazily so huge sweeps are never materialised"""
+    for point, overrides in enumerate(points):
+        for first in range(0, seeds, chunk):
+            yield (point, mode, overrides, first, min(chunk, seeds - first), max_ticks)
+
+def run_sweep(mode, points, seeds, out_path, summary_path, workers=None, chunk=50, max_ticks=MAX_TICKS):
+    """Run every grid point for `seeds` seeds, streaming rows to out_path"""
+    workers = workers or os.cpu_count() or 1
+    stats = [{name: Distribution(bucket) for name, bucket in METRICS.items()} for _ in points]
+    tasks = iter_tasks(mode, points, seeds, chunk, max_ticks)
+    games = 0
+
+    with open(out_path, "w", newline="") as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = csv.writer(out)
+        writer.writerow(GAME_FIELDS + TUNABLE)
+        # Keep a bounded number of chunks in flight so memory stays flat
+        pending = {pool.submit(run_chunk, t) for t in itertools.islice(tasks, workers * 4)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                point, rows = fut.result()
+                params = [points[point].get(name, MODE_CONFIGS[mode][name]) for name in TUNABLE]
+                for seed, score, survival, hit_rate, ticks in rows:
+                    writer.writerow([point, seed, score, f"{survival:.2f}", f"{hit_rate:.4f}", ticks] + params)
+                    dist = stats[point]
+                    dist["score"].add(score)
+                    dist["survival_sec"].add(survival)
+                    dist["hit_rate"].add(hit_rate)
+                games += len(rows)
+            out.flush()
+            for t in itertools.islice(tasks, len(done)):
+                pending.add(pool.submit(run_chunk, t))
+
+    with open(summary_path, "w", newline="") as out:
+        writer = csv.writer(out)
+        header = ["point", "mode", "games"] + list(TUNABLE)
+        for name in METRICS:
+            header += [f"{name}_mean", f"{name}_min", f"{name}_p50", f"{name}_p95", f"{name}_max"]
+        writer.writerow(header)
+        for point, overrides in enumerate(points):
+            dists = stats[point]
+            row = [point, mode, dists["score"].count] + [overrides.get(n, MODE_CONFIGS[mode][n]) for n in TUNABLE]
+            for name in METRICS:
+                d = dists[name]
+                row += [round(v, 4) for v in (d.mean(), d.low, d.quantile(0.5), d.quantile(0.95), d.high)]
+            writer.writerow(row)
+    return games
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless bot sweeps over MODE_CONFIGS parameters")
+    parser.add_argument("--mode", choices=list(MODE_CONFIGS), default="Easy")
+    parser.add_argument("--grid", action="append", metavar="NAME=V1,V2,...",
+                        help=f"parameter values to sweep; one of {', '.join(TUNABLE)} (repeatable)")
+    parser.add_argument("--seeds", type=int, default=100, help="games per grid point")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=50, help="seeds per worker task")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS, help="cap on ticks per game")
+    parser.add_argument("--out", default="sweep.csv", help="per-game CSV output")
+    parser.add_argument("--summary", default=None, help="summary CSV output (default: <out>_summary.csv)")
+    args = parser.parse_args(argv)
+    for flag, value in (("--seeds", args.seeds), ("--chunk", args.chunk)):
+        if value <= 0:
+            parser.error(f"{flag} must be greater than 0, got {value}")
+
+    try:
+        points = parse_grid(args.grid)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    summary = args.summary or os.path.splitext(args.out)[0] + "_summary.csv"
+
+    t0 = time.perf_counter()
+    games = run_sweep(args.mode, points, args.seeds, args.out, summary, args.workers, args.chunk, args.max_ticks)
+    elapsed = time.perf_counter() - t0
+    print(f"{games} games over {len(points)} grid points in {elapsed:.1f}s ({games / elapsed:.1f} games/s)")
+    print(f"Per-game results: {args.out}")
+    print(f"Summary: {summary}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Broadphase collision detection using a uniform spatial hash
+"""
+CELL_SIZE = 64
+# Cells are keyed by cx * KEY_STRIDE + cy: an int, so lookups build no tuples
+KEY_STRIDE = 1 << 16
+
+def rects_overlap(a, b):
+    """Return True if two (x, y, w, h) rects overlap, like pygame.Rect.colliderect"""
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+class SpatialHash:
+    """Uniform grid that buckets rect indices by the cells they cover"""
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        """Remove every entry from the grid"""
+        self.cells.clear()
+
+    def insert(self, index: int, rect):
+        """Add an index to every cell covered by an (x, y, w, h) rect"""
+        self.insert_box(index, int(rect[0]), int(rect[1]), int(rect[2]), int(rect[3]))
+
+    def insert_box(self, index: int, x: int, y: int, w: int, h: int):
+        """Add an index to every cell covered by the integer box x, y, w, h"""
+        cs = self.cell_size
+        cells = self.cells
+        for cx in range(x // cs, (x + w - 1) // cs + 1):
+            for cy in range(y // cs, (y + h - 1) // cs + 1):
+                key = cx * KEY_STRIDE + cy
+                bucket = cells.get(key)
+                if bucket is None:
+                    cells[key] = [index]
+                else:
+                    bucket.append(index)
+
+    def remove_box(self, index: int, x: int, y: int, w: int, h: int):
+        """Take an index inserted with the same box back out of its cells, keeping bucket order"""
+        cs = self.cell_size
+        cells = self.cells
+        for cx in range(x // cs, (x + w - 1) // cs + 1):
+            for cy in range(y // cs, (y + h - 1) // cs + 1):
+                cells[cx * KEY_STRIDE + cy].remove(index)
+
+    def build(self, rects):
+        """Reset the grid and insert every rect under its list index.
+
+        Buckets are emptied in place rather than dropped, so a grid reused
+        across frames stops allocating once every visited cell exists.
+        """
+        self.reset()
+        for i, r in enumerate(rects):
+            self.insert(i, r)
+
+    def reset(self):
+        """Empty every bucket in place, keeping the cells for reuse"""
+        for bucket in self.cells.values():
+            bucket.clear()
+
+    def first_overlap(self, x: int, y: int, w: int, h: int, xs, ys, pw: int, ph: int, order=None) -> int:
+        """Lowest inserted index whose box (xs[j], ys[j], pw, ph) overlaps x, y, w, h, or -1.
+
+        The allocation-free counterpart of one find_hits target, for boxes
+        kept in parallel arrays rather than tuples. Given `order`, the
+        overlapping index with the lowest order[j] wins instead.
+        """
+        cs = self.cell_size
+        cells = self.cells
+        best = rank = -1
+        for cx in range(x // cs, (x + w - 1) // cs + 1):
+            for cy in range(y // cs, (y + h - 1) // cs + 1):
+                bucket = cells.get(cx * KEY_STRIDE + cy)
+                if not bucket:
+                    continue
+                for j in bucket:
+                    r = j if order is None else order[j]
+                    if best >= 0 and r >= rank:
+                        if order is None:
+                            break  # Buckets fill in index order, so nothing later ranks lower
+                        continue
+                    px, py = xs[j], ys[j]
+                    if x < px + pw and px < x + w and y < py + ph and py < y + h:
+                        best, rank = j, r
+                        if order is None:
+                            break
+        return best
+
+def find_hits(targets, projectiles, consume: bool = False, grid: SpatialHash = None):
+    """Find target/projectile collisions through the spatial hash.
+
+    Returns (target_index, projectile_index) pairs in the same order a nested
+    loop over targets then projectiles would report them: each target takes
+    the lowest-index projectile it overlaps. With consume=True a projectile
+    can only be taken once, matching loops that remove the bullet on a hit.
+    """
+    if not targets or not projectiles:
+        return []
+    if grid is None:
+        grid = SpatialHash()
+    grid.build(projectiles)
+
+    hits = []
+    used = set() if consume else None
+    cs = grid.cell_size
+    cells = grid.cells
+    for i, t in enumerate(targets):
+        x, y = int(t[0]), int(t[1])
+        best = -1
+        for cx in range(x // cs, (x + int(t[2]) - 1) // cs + 1):
+            for cy in range(y // cs, (y + int(t[3]) - 1) // cs + 1):
+                bucket = cells.get(cx * KEY_STRIDE + cy)
+                if not bucket:
+                    continue
+                # Buckets are filled in index order, so the first overlap wins
+                for j in bucket:
+                    if best >= 0 and j >= best:
+                        break
+                    if used is not None and j in used:
+                        continue
+                    if rects_overlap(t, projectiles[j]):
+                        best = j
+                        break
+        if best >= 0:
+            hits.append((i, best))
+            if used is not None:
+                used.add(best)
+    return hits
+
+def find_hits_naive(targets, projectiles, consume: bool = False):
+    """Reference nested-loop version of find_hits, kept for benchmarks"""
+    hits = []
+    used = set()
+    for i, t in enumerate(targets):
+        for j, p in enumerate(projectiles):
+            if consume and j in used:
+                continue
+            if rects_overlap(t, p):
+                hits.append((i, j))
+                used.add(j)
+                break
+    return hits
@@ -1,11 +1,13 @@
 """
 Game configuration and constants
 """
+import os
 WIDTH, HEIGHT = 900, 650
 FPS = 60
 DB_FILE = "sqlite:///scores.db"
 
-# Mode configurations
+# Mode configurations. A mode may add "bg_layers": [(image path, pixels per
+# frame), ...], alpha images scrolled over bg_image for parallax.
 MODE_CONFIGS = {
     "Easy": {
         "player_speed": 6,
@@ -44,3 +46,40 @@ MODE_CONFIGS = {
         },
     },
 }
+
+# Simulation runs at FPS ticks per second whatever the display refresh rate;
+# RENDER_FPS caps drawing (e.g. 144 on fast displays, 30 on weak machines)
+RENDER_FPS = FPS
+# Most simulation ticks run per rendered frame before the game slows down
+MAX_FRAME_STEPS = 5
+
+# Pre-scaled raw pixel buffers baked from media/ (see modules/assetcache.py)
+ASSET_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".asset_cache")
+
+# Dirty-rectangle rendering: static background, only changed regions updated
+DIRTY_RECTS = False
+
+# Append-only journal of queued score writes, replayed by db_init after a crash
+JOURNAL_FILE = "scores.journal"
+
+# Best rows per mode kept in memory by the leaderboard cache
+LEADERBOARD_SIZE = 1000
+
+# Recorded games (seed, mode and inputs), replayed by `python -m modules.replay audit`
+REPLAY_DIR = "replays"
+
+# Per-phase frame profiling: start with it on (F3 toggles it in game), frames
+# kept in its ring buffer, and the file prefix its CSV and Chrome trace go to
+PROFILE = False
+PROFILE_FRAMES = 3600
+PROFILE_OUT = "profile"
+
+# Sound effect channel groups: mixer channels reserved per category, which
+# caps how many of its sounds play at once
+SOUND_GROUPS = {"weapon": 2, "impact": 4, "event": 1}
+# Sound name -> (category, priority). A sound finding its group busy takes
+# the voice of the lowest-priority, oldest sound there unless that outranks it
+SOUND_PRIORITIES = {"shoot": ("weapon", 0), "explode": ("impact", 1), "hit": ("impact", 2)}
+
+# Most milliseconds main.py may spend importing, checked by `python -m modules.startup`
+STARTUP_BUDGET_MS = 250
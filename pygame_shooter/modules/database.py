@@ -1,19 +1,39 @@
 """
 Database operations using SQLAlchemy
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, CheckConstraint
-from sqlalchemy.orm import declarative_base, sessionmaker
+import itertools
+import json
+from sqlalchemy import create_engine, event, bindparam, select, func, tuple_, Column, Integer, String, Float, CheckConstraint, Index
+from sqlalchemy.orm import declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 from modules.config import DB_FILE
+from modules.storage import apply_pragmas, STATEMENT_CACHE
 
 Base = declarative_base()
-engine = create_engine(DB_FILE, echo=False)
-Session = sessionmaker(bind=engine)
+# Pooled connections, each tuned once when it is first opened
+engine = create_engine(DB_FILE, echo=False, connect_args={"cached_statements": STATEMENT_CACHE})
+event.listen(engine, "connect", lambda dbapi_conn, record: apply_pragmas(dbapi_conn))
+
+# Called as fn(removed, added) with full score tuples after each committed write;
+# (None, None) means rows changed in bulk and cached copies should be dropped
+SCORE_LISTENERS = []
+
+def _notify(removed, added):
+    for listener in SCORE_LISTENERS:
+        listener(removed, added)
+
+# Values allowed by the check_mode constraint
+MODES = ("Easy", "Medium", "Hard")
 
 class Score(Base):
     __tablename__ = 'scores'
     __table_args__ = (
-        CheckConstraint("mode in ('Easy','Medium','Hard')", name='check_mode'),
+        CheckConstraint(f"mode in ({','.join(repr(m) for m in MODES)})", name='check_mode'),
+        # Leaderboard order, with and without a mode filter
+        Index('ix_scores_mode_score_played', 'mode', 'score', 'played_at'),
+        Index('ix_scores_score_played', 'score', 'played_at'),
+        # Finds a player's new best in a mode when their best row goes away
+        Index('ix_scores_player_mode_score', 'player', 'mode', 'score'),
     )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -23,89 +43,486 @@ class Score(Base):
     duration_sec = Column(Float, nullable=False)
     played_at = Column(String, nullable=False)
 
+# Score histogram buckets: HIST_BINS bins of HIST_BIN_WIDTH points, the last one open-ended
+HIST_BIN_WIDTH = 100
+HIST_BINS = 20
+
+class PlayerModeStats(Base):
+    """Running totals per (player, mode), kept in step with `scores` by every write"""
+    __tablename__ = 'player_mode_stats'
+
+    player = Column(String, primary_key=True)
+    mode = Column(String, primary_key=True)
+    games = Column(Integer, nullable=False)
+    total_score = Column(Integer, nullable=False)
+    best_score = Column(Integer, nullable=False)
+    total_duration = Column(Float, nullable=False)
+    histogram = Column(String, nullable=False)  # JSON list of HIST_BINS counts
+
+class ModeStats(Base):
+    """Running totals per mode over all players, folded from the same deltas as PlayerModeStats"""
+    __tablename__ = 'mode_stats'
+
+    mode = Column(String, primary_key=True)
+    players = Column(Integer, nullable=False)
+    games = Column(Integer, nullable=False)
+    total_score = Column(Integer, nullable=False)
+    best_score = Column(Integer, nullable=False)
+    total_duration = Column(Float, nullable=False)
+    histogram = Column(String, nullable=False)
+
 def db_init():
     """Initialize the database"""
     try:
         Base.metadata.create_all(engine)
+        db_migrate()
     except SQLAlchemyError as e:
         print(f"Error initializing database: {e}")
+        return
+    # Rows queued but not committed before a crash are still in the journal
+    from modules.scorewriter import replay_journal
+    replay_journal()
+
+def db_migrate():
+    """Bring an existing scores.db up to date (adds indexes and stats missing from older files)"""
+    for index in Score.__table__.indexes:
+        index.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        missing = (conn.execute(select(Score.id).limit(1)).first() is not None
+                   and any(conn.execute(select(func.count()).select_from(table)).scalar() == 0
+                           for table in (PlayerModeStats, ModeStats)))
+    if missing:
+        db_rebuild_stats()
+
+def db_drop_indexes():
+    """Drop the secondary indexes ahead of a bulk load; db_rebuild_indexes() restores them"""
+    try:
+        for index in Score.__table__.indexes:
+            index.drop(engine, checkfirst=True)
+    except SQLAlchemyError as e:
+        print(f"Error dropping indexes: {e}")
+
+def db_rebuild_indexes():
+    """Recreate missing secondary indexes, sorting through temp files so memory stays bounded"""
+    try:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA temp_store=FILE")
+            try:
+                for index in Score.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+                conn.commit()
+            finally:
+                apply_pragmas(conn.connection.dbapi_connection)
+    except SQLAlchemyError as e:
+        print(f"Error rebuilding indexes: {e}")
+
+def _stats_deltas(rows, sign: int, deltas: dict = None) -> dict:
+    """Accumulate (player, mode, score, duration_sec) rows added (sign=1) or removed (sign=-1)"""
+    deltas = {} if deltas is None else deltas
+    slot = 3 if sign > 0 else 4
+    last_bin = HIST_BINS - 1
+    for player, mode, score, duration_sec in rows:
+        d = deltas.get((player, mode))
+        if d is None:
+            # games, total score, total duration, best added, best removed, histogram
+            d = deltas[(player, mode)] = [0, 0, 0.0, None, None, [0] * HIST_BINS]
+        d[0] += sign
+        d[1] += sign * score
+        d[2] += sign * duration_sec
+        if d[slot] is None or score > d[slot]:
+            d[slot] = score
+        b = score // HIST_BIN_WIDTH
+        d[5][b if 0 <= b < last_bin else (0 if b < 0 else last_bin)] += sign
+    return deltas
+
+def _fold_stats(existing: dict, deltas: dict, best_after):
+    """Split deltas into the stats rows to insert, update and delete, as (key, values) pairs.
+
+    `existing` maps the same keys as `deltas` to current stats rows;
+    best_after(key) reads a key's best from `scores` when its best row may
+    have gone.
+    """
+    inserts, updates, deletes = [], [], []
+    for key, (games, total, duration, added, removed, hist) in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            if games > 0:
+                inserts.append((key, {"games": games, "total_score": total, "best_score": added,
+                                      "total_duration": duration, "histogram": json.dumps(hist)}))
+            continue
+        games += row.games
+        if games <= 0:
+            deletes.append((key, {}))
+            continue
+        best = row.best_score
+        if removed is not None and removed >= best:
+            best = best_after(key)
+        elif added is not None and added > best:
+            best = added
+        merged = [a + b for a, b in zip(json.loads(row.histogram), hist)]
+        updates.append((key, {"games": games, "total_score": row.total_score + total, "best_score": best,
+                              "total_duration": row.total_duration + duration, "histogram": json.dumps(merged)}))
+    return inserts, updates, deletes
+
+def _apply_stats(conn, deltas: dict):
+    """Fold deltas into player_mode_stats and mode_stats; run after the matching `scores` change, in its transaction"""
+    stats = PlayerModeStats.__table__
+    keys = list(deltas)
+    existing = {}
+    for i in range(0, len(keys), 500):
+        query = select(stats).where(tuple_(stats.c.player, stats.c.mode).in_(keys[i:i + 500]))
+        existing.update(((row.player, row.mode), row) for row in conn.execute(query))
+    # The (player, mode, score) index finds a player's new best
+    inserts, updates, deletes = _fold_stats(existing, deltas, lambda key: conn.execute(
+        select(func.max(Score.score)).where(Score.player == key[0], Score.mode == key[1])).scalar())
+    by_key = (stats.c.player == bindparam("k_player")) & (stats.c.mode == bindparam("k_mode"))
+    if inserts:
+        conn.execute(stats.insert(), [dict(v, player=k[0], mode=k[1]) for k, v in inserts])
+    if updates:
+        conn.execute(stats.update().where(by_key), [dict(v, k_player=k[0], k_mode=k[1]) for k, v in updates])
+    if deletes:
+        conn.execute(stats.delete().where(by_key), [{"k_player": k[0], "k_mode": k[1]} for k, _ in deletes])
+
+    # Sum the same deltas per mode; a player's first or last game in a mode changes its player count
+    mode_deltas, players = {}, {}
+    for (player, mode), (games, total, duration, added, removed, hist) in deltas.items():
+        d = mode_deltas.get(mode)
+        if d is None:
+            mode_deltas[mode] = [games, total, duration, added, removed, list(hist)]
+            continue
+        d[0] += games
+        d[1] += total
+        d[2] += duration
+        for slot, score in ((3, added), (4, removed)):
+            if score is not None and (d[slot] is None or score > d[slot]):
+                d[slot] = score
+        d[5] = [a + b for a, b in zip(d[5], hist)]
+    for rows, sign in ((inserts, 1), (deletes, -1)):
+        for (player, mode), _ in rows:
+            players[mode] = players.get(mode, 0) + sign
+    modes = ModeStats.__table__
+    existing = {row.mode: row for row in conn.execute(select(modes))}
+    # The (mode, score, played_at) index finds a mode's new best
+    inserts, updates, deletes = _fold_stats(existing, mode_deltas, lambda mode: conn.execute(
+        select(func.max(Score.score)).where(Score.mode == mode)).scalar())
+    for mode, values in inserts:
+        conn.execute(modes.insert().values(mode=mode, players=players.get(mode, 0), **values))
+    for mode, values in updates:
+        players_now = existing[mode].players + players.get(mode, 0)
+        conn.execute(modes.update().where(modes.c.mode == mode).values(players=players_now, **values))
+    for mode, _ in deletes:
+        conn.execute(modes.delete().where(modes.c.mode == mode))
+
+def db_rebuild_stats():
+    """Recompute player_mode_stats and mode_stats from scratch with one pass over `scores`"""
+    stats = PlayerModeStats.__table__
+    modes = ModeStats.__table__
+    bin_expr = func.min(func.max(Score.score, 0) // HIST_BIN_WIDTH, HIST_BINS - 1)
+    try:
+        with engine.begin() as conn:
+            hists = {}
+            for player, mode, b, n in conn.execute(select(Score.player, Score.mode, bin_expr, func.count())
+                                                   .group_by(Score.player, Score.mode, bin_expr)):
+                hists.setdefault((player, mode), [0] * HIST_BINS)[b] = n
+            totals = conn.execute(select(Score.player, Score.mode, func.count(), func.sum(Score.score),
+                                         func.max(Score.score), func.sum(Score.duration_sec))
+                                  .group_by(Score.player, Score.mode)).all()
+            conn.execute(stats.delete())
+            conn.execute(modes.delete())
+            if totals:
+                conn.execute(stats.insert(), [
+                    {"player": player, "mode": mode, "games": games, "total_score": total, "best_score": best,
+                     "total_duration": duration, "histogram": json.dumps(hists[(player, mode)])}
+                    for player, mode, games, total, best, duration in totals
+                ])
+                by_mode = {}
+                for player, mode, games, total, best, duration in totals:
+                    m = by_mode.setdefault(mode, {"mode": mode, "players": 0, "games": 0, "total_score": 0,
+                                                  "best_score": best, "total_duration": 0.0, "histogram": [0] * HIST_BINS})
+                    m["players"] += 1
+                    m["games"] += games
+                    m["total_score"] += total
+                    m["best_score"] = max(m["best_score"], best)
+                    m["total_duration"] += duration
+                    m["histogram"] = [a + b for a, b in zip(m["histogram"], hists[(player, mode)])]
+                conn.execute(modes.insert(), [dict(m, histogram=json.dumps(m["histogram"])) for m in by_mode.values()])
+    except SQLAlchemyError as e:
+        print(f"Error rebuilding player stats: {e}")
+
+def _stats_dict(row) -> dict:
+    games = row.games
+    return {
+        "player": row.player,
+        "mode": row.mode,
+        "games": games,
+        "best": row.best_score,
+        "mean_score": row.total_score / games,
+        "mean_duration": row.total_duration / games,
+        "histogram": json.loads(row.histogram),
+    }
+
+def db_player_stats(player: str, mode: str):
+    """Get one player's aggregates for a mode (a single primary-key lookup), or None"""
+    stats = PlayerModeStats.__table__
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(select(stats).where(stats.c.player == player, stats.c.mode == mode)).first()
+            return _stats_dict(row) if row else None
+    except SQLAlchemyError as e:
+        print(f"Error getting player stats: {e}")
+        return None
+
+def db_all_stats(mode_filter: str = None):
+    """Get every (player, mode) aggregate, best first; one row per player and mode, however long the history"""
+    stats = PlayerModeStats.__table__
+    query = select(stats).order_by(stats.c.best_score.desc(), stats.c.player, stats.c.mode)
+    if mode_filter and mode_filter in MODES:
+        query = query.where(stats.c.mode == mode_filter)
+    try:
+        with engine.connect() as conn:
+            return [_stats_dict(row) for row in conn.execute(query)]
+    except SQLAlchemyError as e:
+        print(f"Error getting player stats: {e}")
+        return []
+
+def db_mode_stats(mode: str):
+    """Aggregates for a whole mode (players, games, best, mean score and duration, histogram), or None; one primary-key read"""
+    modes = ModeStats.__table__
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(select(modes).where(modes.c.mode == mode)).first()
+    except SQLAlchemyError as e:
+        print(f"Error getting mode stats: {e}")
+        return None
+    if row is None:
+        return None
+    games = row.games
+    return {
+        "mode": mode,
+        "players": row.players,
+        "games": games,
+        "best": row.best_score,
+        "mean_score": row.total_score / games,
+        "mean_duration": row.total_duration / games,
+        "histogram": json.loads(row.histogram),
+    }
+
+SCORE_COLUMNS = (Score.id, Score.player, Score.mode, Score.score, Score.duration_sec, Score.played_at)
+
+def _leaderboard_query(mode_filter: str = None):
+    """Core SELECT of score tuples in leaderboard order (no ORM objects)"""
+    query = select(*SCORE_COLUMNS)
+    if mode_filter and mode_filter in MODES:
+        query = query.where(Score.mode == mode_filter)
+    return query.order_by(Score.score.desc(), Score.played_at.desc(), Score.id.desc())
+
+def db_top_scores(limit: int = 10, mode_filter: str = None):
+    """Get the best `limit` scores, optionally filtered by mode"""
+    try:
+        with engine.connect() as conn:
+            return [tuple(r) for r in conn.execute(_leaderboard_query(mode_filter).limit(limit))]
+    except SQLAlchemyError as e:
+        print(f"Error getting top scores: {e}")
+        return []
+
+def db_get_scores_page(mode_filter: str = None, after: tuple = None, limit: int = 50, before: tuple = None):
+    """Get one page of scores in leaderboard order using keyset pagination.
+
+    Pass the last row of the previous page as `after` to fetch the next one,
+    or the first row of the current page as `before` to fetch the one above
+    it; the cost is independent of how deep into the table the page is.
+    """
+    key = tuple_(Score.score, Score.played_at, Score.id)
+    query = _leaderboard_query(mode_filter)
+    if after:
+        query = query.where(key < tuple_(after[3], after[5], after[0]))
+    if before:
+        # Walk upwards in reverse order, then flip back to leaderboard order
+        query = query.where(key > tuple_(before[3], before[5], before[0]))
+        query = query.order_by(None).order_by(Score.score, Score.played_at, Score.id)
+    try:
+        with engine.connect() as conn:
+            rows = [tuple(r) for r in conn.execute(query.limit(limit))]
+        return rows[::-1] if before else rows
+    except SQLAlchemyError as e:
+        print(f"Error getting scores page: {e}")
+        return []
+
+def db_get_scores_window(mode_filter: str = None, offset: int = 0, limit: int = 50):
+    """Get `limit` scores starting at row `offset` of the leaderboard (for scrollbar jumps)"""
+    try:
+        with engine.connect() as conn:
+            return [tuple(r) for r in conn.execute(_leaderboard_query(mode_filter).offset(offset).limit(limit))]
+    except SQLAlchemyError as e:
+        print(f"Error getting scores window: {e}")
+        return []
+
+def db_count_scores(mode_filter: str = None) -> int:
+    """Count scores, optionally filtered by mode"""
+    query = select(func.count()).select_from(Score)
+    if mode_filter and mode_filter in MODES:
+        query = query.where(Score.mode == mode_filter)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(query).scalar()
+    except SQLAlchemyError as e:
+        print(f"Error counting scores: {e}")
+        return 0
+
+def db_get_score(record_id: int):
+    """Get a single score tuple by id, or None"""
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(select(*SCORE_COLUMNS).where(Score.id == record_id)).first()
+            return tuple(row) if row else None
+    except SQLAlchemyError as e:
+        print(f"Error getting score: {e}")
+        return None
+
+def db_find_scores(player: str, mode: str, played_at: str):
+    """Get the score tuples a finished game could have been stored as (used to audit replays)"""
+    query = select(*SCORE_COLUMNS).where(Score.player == player, Score.mode == mode, Score.played_at == played_at)
+    try:
+        with engine.connect() as conn:
+            return [tuple(r) for r in conn.execute(query)]
+    except SQLAlchemyError as e:
+        print(f"Error finding scores: {e}")
+        return []
 
 def db_add_score(player: str, mode: str, score: int, duration_sec: float, played_at: str = None):
-    """Add a new score to the database"""
+    """Add a new score to the database and return its id (None on failure)"""
     from datetime import datetime
     if not played_at:
         played_at = datetime.now().isoformat(timespec='seconds')
     
     try:
-        session = Session()
-        new_score = Score(
-            player=player,
-            mode=mode,
-            score=score,
-            duration_sec=float(duration_sec),
-            played_at=played_at
-        )
-        session.add(new_score)
-        session.commit()
+        with engine.begin() as conn:
+            result = conn.execute(Score.__table__.insert().values(
+                player=player,
+                mode=mode,
+                score=score,
+                duration_sec=float(duration_sec),
+                played_at=played_at
+            ))
+            _apply_stats(conn, _stats_deltas([(player, mode, score, float(duration_sec))], 1))
+            record_id = result.inserted_primary_key[0]
     except SQLAlchemyError as e:
         print(f"Error adding score: {e}")
-        session.rollback()
-    finally:
-        session.close()
+        return None
+    _notify([], [(record_id, player, mode, score, float(duration_sec), played_at)])
+    return record_id
+
+def db_add_scores(rows) -> bool:
+    """Insert many score dicts (player, mode, score, duration_sec, played_at) in one transaction.
+
+    Meant for the background writer's small batches; use db_import_rows for bulk loads.
+    """
+    if not rows:
+        return True
+    insert = Score.__table__.insert()
+    added = []
+    try:
+        with engine.begin() as conn:
+            for r in rows:
+                record_id = conn.execute(insert, r).inserted_primary_key[0]
+                added.append((record_id, r["player"], r["mode"], r["score"], r["duration_sec"], r["played_at"]))
+            _apply_stats(conn, _stats_deltas((row[1:5] for row in added), 1))
+    except SQLAlchemyError as e:
+        print(f"Error adding scores: {e}")
+        return False
+    _notify([], added)
+    return True
+
+IMPORT_COLUMNS = ("player", "mode", "score", "duration_sec", "played_at")
+
+def db_import_rows(rows, chunk_size: int = 50000) -> int:
+    """Bulk insert (player, mode, score, duration_sec, played_at) tuples and return how many were written.
+
+    Rows are consumed lazily and written with executemany, committing one
+    transaction per chunk, so memory stays bounded by chunk_size. Rows must
+    already be validated; a chunk that violates a constraint is rolled back
+    and the import stops there. Player stats are updated with each chunk.
+    """
+    sql = f"INSERT INTO scores ({', '.join(IMPORT_COLUMNS)}) VALUES ({', '.join('?' * len(IMPORT_COLUMNS))})"
+    rows = iter(rows)
+    written = 0
+    try:
+        with engine.connect() as conn:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                conn.exec_driver_sql(sql, chunk)
+                _apply_stats(conn, _stats_deltas((r[:4] for r in chunk), 1))
+                conn.commit()
+                written += len(chunk)
+    except SQLAlchemyError as e:
+        print(f"Error importing scores after {written} rows: {e}")
+    if written:
+        _notify(None, None)
+    return written
+
+def db_export_rows(mode_filter: str = None, chunk_size: int = 50000):
+    """Yield every score tuple (id first, then IMPORT_COLUMNS) in id order, fetching chunk_size at a time"""
+    query = select(*SCORE_COLUMNS).order_by(Score.id)
+    if mode_filter and mode_filter in MODES:
+        query = query.where(Score.mode == mode_filter)
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(query)
+            for part in result.partitions():
+                yield from part
+    except SQLAlchemyError as e:
+        print(f"Error exporting scores: {e}")
 
 def db_get_scores(mode_filter: str = None):
     """Get scores from the database, optionally filtered by mode"""
     try:
-        session = Session()
-        query = session.query(Score)
-        
-        if mode_filter and mode_filter in ("Easy", "Medium", "Hard"):
-            query = query.filter(Score.mode == mode_filter)
-            
-        results = query.order_by(Score.score.desc(), Score.played_at.desc()).all()
-        
-        return [(r.id, r.player, r.mode, r.score, r.duration_sec, r.played_at) for r in results]
+        with engine.connect() as conn:
+            return [tuple(r) for r in conn.execute(_leaderboard_query(mode_filter))]
     except SQLAlchemyError as e:
         print(f"Error getting scores: {e}")
         return []
-    finally:
-        session.close()
 
 def db_update_score(record_id: int, player: str = None, mode: str = None, score: int = None):
     """Update an existing score in the database"""
+    values = {}
+    if player is not None:
+        values["player"] = player
+    if mode is not None:
+        values["mode"] = mode
+    if score is not None:
+        values["score"] = int(score)
+    if not values:
+        return
+
     try:
-        session = Session()
-        score_obj = session.query(Score).filter(Score.id == record_id).first()
-        
-        if not score_obj:
-            print(f"Score with id {record_id} not found")
-            return
-            
-        if player is not None:
-            score_obj.player = player
-        if mode is not None:
-            score_obj.mode = mode
-        if score is not None:
-            score_obj.score = int(score)
-            
-        session.commit()
+        with engine.begin() as conn:
+            old = conn.execute(select(*SCORE_COLUMNS).where(Score.id == record_id)).first()
+            if old is None:
+                print(f"Score with id {record_id} not found")
+                return
+            conn.execute(Score.__table__.update().where(Score.id == record_id).values(**values))
+            old = tuple(old)
+            new = (record_id, values.get("player", old[1]), values.get("mode", old[2]),
+                   values.get("score", old[3]), old[4], old[5])
+            _apply_stats(conn, _stats_deltas([new[1:5]], 1, _stats_deltas([old[1:5]], -1)))
     except SQLAlchemyError as e:
         print(f"Error updating score: {e}")
-        session.rollback()
-    finally:
-        session.close()
+        return
+    _notify([old], [new])
 
 def db_delete_score(record_id: int):
     """Delete a score from the database"""
     try:
-        session = Session()
-        score_obj = session.query(Score).filter(Score.id == record_id).first()
-        
-        if score_obj:
-            session.delete(score_obj)
-            session.commit()
+        with engine.begin() as conn:
+            old = conn.execute(select(*SCORE_COLUMNS).where(Score.id == record_id)).first()
+            if old is None:
+                return
+            conn.execute(Score.__table__.delete().where(Score.id == record_id))
+            old = tuple(old)
+            _apply_stats(conn, _stats_deltas([old[1:5]], -1))
     except SQLAlchemyError as e:
         print(f"Error deleting score: {e}")
-        session.rollback()
-    finally:
-        session.close()
+        return
+    _notify([old], [])
@@ -0,0 +1,191 @@
+"""
+Array-backed entity pools (structure of arrays, compacted by swap-remove)
+"""
+import math
+from array import array
+
+SHAPES = ("circle", "triangle", "asteroid")
+SHAPE_INDEX = {name: i for i, name in enumerate(SHAPES)}
+# Horizontal sine wobble amplitude per shape index
+WOBBLE = (0, 1, 2)
+
+class EntityPool:
+    """Base pool: one typed array per column, live entities packed at the front.
+
+    Slots 0..count-1 are the live entities. Releasing a slot moves the last
+    live entity into it (swap-remove), so iteration never skips dead slots
+    and, once the pool has grown to the peak live count, spawning and
+    removing entities allocates no arrays or lists. A release changes which
+    entity the last slot holds, so callers releasing several slots must go
+    from the highest slot down (as move() does). Swap-remove also loses
+    spawn order, so every pool keeps a `seq` column numbering entities as
+    they spawn, for callers that must visit them oldest first.
+
+    move() updates the columns in place in one pass over the live slots,
+    noting slots to release in a reused scratch list; a tick creates only
+    the loop's iterators and the floats it computes.
+    """
+    columns = {"seq": "Q"}
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = 0
+        self.count = 0
+        self.spawned = 0
+        # Slots move() found leaving the screen, ascending; reused every tick
+        self._gone = []
+        self._columns = []
+        for name, code in self.columns.items():
+            setattr(self, name, array(code))
+            self._columns.append(getattr(self, name))
+        self.grow(capacity)
+
+    def grow(self, extra: int):
+        """Add extra empty slots to every column"""
+        self.capacity += extra
+        for name, code in self.columns.items():
+            getattr(self, name).extend(array(code, [0]) * extra)
+
+    def acquire(self) -> int:
+        """Take the next free slot, growing the pool if it is full"""
+        if self.count == self.capacity:
+            self.grow(max(self.capacity, 16))
+        slot = self.count
+        self.count += 1
+        self.seq[slot] = self.spawned
+        self.spawned += 1
+        return slot
+
+    def release(self, slot: int):
+        """Remove the entity in a live slot by moving the last live entity into it"""
+        last = self.count - 1
+        if slot > last:
+            return
+        if slot != last:
+            for col in self._columns:
+                col[slot] = col[last]
+        self.count = last
+
+    def slots(self):
+        """Iterate over live slots"""
+        return range(self.count)
+
+    def clear(self):
+        """Release every live slot"""
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def nbytes(self) -> int:
+        """Bytes held by all column buffers"""
+        return sum(a.buffer_info()[1] * a.itemsize for a in self._columns)
+
+    def bytes_per_entity(self) -> float:
+        """Column memory divided by the number of live entities"""
+        return self.nbytes() / max(self.count, 1)
+
+class EnemyPool(EntityPool):
+    """Enemies stored as x/y/speed/size/shape columns, plus last tick's position"""
+    columns = {"seq": "Q", "x": "d", "y": "d", "px": "d", "py": "d", "speed": "d", "size": "h", "shape": "B"}
+
+    def __init__(self, capacity: int = 64):
+        super().__init__(capacity)
+        # Since the pool was last empty: one bit per shape index spawned,
+        # and the speed every enemy was spawned with (None once they differ)
+        self.shapes = 0
+        self.common_speed = None
+
+    def spawn(self, x: float, y: float, speed: float, shape: str, size: int) -> int:
+        """Add an enemy and return its slot"""
+        slot = self.acquire()
+        self.x[slot] = self.px[slot] = x
+        self.y[slot] = self.py[slot] = y
+        self.speed[slot] = speed
+        self.size[slot] = size
+        self.shape[slot] = k = SHAPE_INDEX[shape]
+        if slot == 0:
+            self.shapes = 1 << k
+            self.common_speed = float(speed)
+        else:
+            self.shapes |= 1 << k
+            if speed != self.common_speed:
+                self.common_speed = None
+        return slot
+
+    def move(self, frame: int, bottom: int):
+        """Advance every enemy one frame and release those past the bottom edge.
+
+        Last tick's position is copied array to array (a memcpy, as both
+        columns have the same length), then one loop steps y and x in
+        place. When every live enemy has the same shape and speed (each
+        mode spawns one of each) the loop is specialised to those.
+        """
+        n = self.count
+        if not n:
+            return
+        xs, ys = self.x, self.y
+        self.px[:] = xs
+        self.py[:] = ys
+        sin = math.sin
+        gone = self._gone
+        shapes, speed = self.shapes, self.common_speed
+        amp = None if shapes & (shapes - 1) else WOBBLE[shapes.bit_length() - 1]
+        if amp is None or speed is None:
+            amps = WOBBLE
+            for i, x, y, speed, shape in zip(range(n), xs, ys, self.speed, self.shape):
+                y += speed
+                ys[i] = y
+                amp = amps[shape]
+                if amp:
+                    xs[i] = x + sin((frame + y) * 0.03) * amp
+                if y >= bottom:
+                    gone.append(i)
+        elif amp:
+            for i, x, y in zip(range(n), xs, ys):
+                y += speed
+                ys[i] = y
+                xs[i] = x + sin((frame + y) * 0.03) * amp
+                if y >= bottom:
+                    gone.append(i)
+        else:
+            for i, y in zip(range(n), ys):
+                y += speed
+                ys[i] = y
+                if y >= bottom:
+                    gone.append(i)
+        # y >= bottom only shortlists; an enemy leaves once its top edge is past the bottom
+        sizes = self.size
+        while gone:
+            s = gone.pop()
+            if ys[s] - sizes[s] >= bottom:
+                self.release(s)
+
+class BulletPool(EntityPool):
+    """Bullets stored as integer x/y columns with a shared size, plus last tick's y"""
+    columns = {"seq": "Q", "x": "i", "y": "i", "py": "i"}
+    width = 6
+    height = 12
+
+    def spawn(self, x: int, y: int) -> int:
+        """Add a bullet and return its slot"""
+        slot = self.acquire()
+        self.x[slot] = x
+        self.y[slot] = self.py[slot] = y
+        return slot
+
+    def move(self, dy: int):
+        """Move every bullet by dy in place and release those above the top edge"""
+        n = self.count
+        if not n:
+            return
+        ys = self.y
+        self.py[:] = ys
+        top = -self.height
+        gone = self._gone
+        for i, y in zip(range(n), ys):
+            y += dy
+            ys[i] = y
+            if y <= top:
+                gone.append(i)
+        while gone:
+            self.release(gone.pop())
@@ -2,40 +2,107 @@
 Game logic and rendering
 """
 import pygame
-import math
 import random
 import time
 import os
 import sys
 from datetime import datetime
-from modules.config import WIDTH, HEIGHT, FPS, MODE_CONFIGS
+from modules.config import WIDTH, HEIGHT, RENDER_FPS, DIRTY_RECTS, MODE_CONFIGS, PROFILE, PROFILE_OUT
 from modules.assets import load_assets
-from modules.database import db_add_score
-from modules.ui import open_scoreboard
+from modules.audio import AUDIO
+from modules.entities import SHAPES
+from modules.simulation import GameState, step, INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, PLAYER_W, PLAYER_H
+from modules.timestep import FixedTimestep, lerp
+from modules.textcache import TEXT_CACHE, GlyphAtlas
+from modules.render import FullRenderer, DirtyRenderer, SpriteBatch
+from modules.replay import ReplayRecorder, save_replay
+from modules.profiler import FrameProfiler, ProfileOverlay, GcMonitor, NULL_PROFILER
+
+HUD_COLOR = (240, 240, 240)
 
 def draw_background(screen, mode_cfg, assets, frame):
     """Draw the scrolling background"""
     bg = assets["backgrounds"][mode_cfg["mode"]]
     if bg:
-        bg_x = -(frame % WIDTH)
-        screen.blit(bg, (bg_x, 0))
-        screen.blit(bg, (bg_x + WIDTH, 0))
+        bg.draw(screen, frame)
     else:
         screen.fill((10, 10, 40))
 
-def spawn_enemy(mode_cfg):
-    """Create a new enemy with random position"""
-    x = random.randint(20, WIDTH - 20)
-    y = -30
-    speed = mode_cfg["enemy_speed"]
-    shape = mode_cfg["enemy_shape"]
-    size = 18
-    return {"x": x, "y": y, "speed": speed, "shape": shape, "size": size}
+def static_background(mode_cfg, assets):
+    """Build the unscrolled, screen-sized background used by dirty-rect rendering"""
+    surf = pygame.Surface((WIDTH, HEIGHT))
+    draw_background(surf, mode_cfg, assets, 0)
+    return surf
+
+def draw_game(canvas, state, assets, font, digits, alpha: float = 1.0, prof=NULL_PROFILER, batch: SpriteBatch = None):
+    """Draw a simulation state, interpolated alpha of the way from the previous tick.
+
+    Pass the same `batch` every frame of a game to reuse its destination lists.
+    """
+    cfg = state.cfg
+    screen = canvas.screen
+    canvas.begin()
+    if not canvas.static:
+        draw_background(screen, cfg, assets, state.frame - 1 + alpha)
+    prof.mark("background")
+
+    player_x = lerp(state.prev_player_x, state.player_x, alpha)
+    if assets["player"]:
+        canvas.blit(assets["player"], (player_x, state.player_y))
+    else:
+        canvas.mark(pygame.draw.rect(screen, (0, 255, 0), (player_x, state.player_y, PLAYER_W, PLAYER_H)))
+
+    draw_sprites(canvas, state, assets, alpha, batch)
+    prof.mark("sprites")
+
+    draw_hud(canvas, state, font, digits)
+    prof.mark("hud")
+
+def draw_sprites(canvas, state, assets, alpha: float = 1.0, batch: SpriteBatch = None):
+    """Draw bullets and enemies with one blits() call per texture"""
+    screen = canvas.screen
+    if batch is None:
+        batch = SpriteBatch()
+    batch.begin()
+
+    bullets = state.bullets
+    bx, by, bpy = bullets.x, bullets.y, bullets.py
+    if assets["bullet"]:
+        batch.dests(assets["bullet"]).extend(
+            [(bx[s], bpy[s] + (by[s] - bpy[s]) * alpha) for s in range(bullets.count)])
+    else:
+        color = state.cfg["palette"]["bullet"]
+        for s in range(bullets.count):
+            y = lerp(bpy[s], by[s], alpha)
+            canvas.mark(pygame.draw.rect(screen, color, (bx[s], y, bullets.width, bullets.height)))
+
+    enemies = state.enemies
+    images = [assets["enemies"][name] for name in SHAPES]
+    dests = [batch.dests(img) if img else None for img in images]
+    ex, ey, epx, epy, sizes, shapes = enemies.x, enemies.y, enemies.px, enemies.py, enemies.size, enemies.shape
+    for s in range(enemies.count):
+        size = sizes[s]
+        x = epx[s] + (ex[s] - epx[s]) * alpha
+        y = epy[s] + (ey[s] - epy[s]) * alpha
+        group = dests[shapes[s]]
+        if group is not None:
+            group.append((x - size, y - size))
+        else:
+            canvas.mark(pygame.draw.circle(screen, (255, 0, 0), (int(x), int(y)), size))
+
+    batch.draw(canvas)
 
-def enemy_rect(enemy):
-    """Get the pygame Rect for an enemy"""
-    size = enemy["size"]
-    return pygame.Rect(enemy["x"] - size, enemy["y"] - size, size * 2, size * 2)
+def draw_hud(canvas, state, font, digits):
+    """Draw the HUD from cached label surfaces and digit glyphs"""
+    x, y = 14, 10
+    label = TEXT_CACHE.render(font, f"Mode: {state.mode}   Score: ", HUD_COLOR)
+    canvas.blit(label, (x, y))
+    x += label.get_width()
+    x += digits.draw(canvas, str(state.score), (x, y))
+    label = TEXT_CACHE.render(font, "   Lives: ", HUD_COLOR)
+    canvas.blit(label, (x, y))
+    x += label.get_width()
+    digits.draw(canvas, str(state.lives), (x, y))
 
 def game_over(screen, bigfont, score):
     """Display game over screen"""
@@ -60,21 +127,33 @@ def game_over(screen, bigfont, score):
             if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
                 waiting = False
 
-def run_game(mode_name: str = "Easy"):
-    """Run the main game loop"""
-    pygame.init()
+def run_game(mode_name: str = "Easy", render_fps: int = RENDER_FPS, dirty: bool = DIRTY_RECTS):
+    """Run the main game loop: fixed-rate simulation ticks, rendering capped at render_fps.
+
+    With dirty=True the background stays still and only changed regions are
+    pushed to the display. F3 toggles per-phase profiling and its overlay;
+    recorded timings are dumped to PROFILE_OUT.csv / .trace.json on exit.
+    """
+    launch_time = time.perf_counter()
+    # Only what the game uses; the mixer is started by AUDIO.init() below
+    pygame.display.init()
+    pygame.font.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption(f"Space Shooter — {mode_name}")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont("arial", 20)
     bigfont = pygame.font.SysFont("arial", 36, bold=True)
+    digits = GlyphAtlas(font, HUD_COLOR)
 
     if mode_name not in MODE_CONFIGS:
         mode_name = "Easy"
 
     cfg = MODE_CONFIGS[mode_name]
     cfg["mode"] = mode_name
-    assets = load_assets()
+    audio = AUDIO.init()
+    assets = load_assets(mode_name)
+    if audio:
+        AUDIO.load(assets["sounds"])
 
     try:
         pygame.mixer.music.load(assets["music"][mode_name])
@@ -82,120 +161,115 @@ def run_game(mode_name: str = "Easy"):
     except:
         print("Could not load music")
 
-    player = pygame.Rect(WIDTH // 2 - 25, HEIGHT - 70, 50, 40)
-    player_speed = cfg["player_speed"]
-    bullets = []
-    enemies = []
-    score = 0
-    lives = 3 if mode_name != "Hard" else 2
-    frame = 0
-    last_shot = 0
+    canvas = DirtyRenderer(screen, static_background(cfg, assets)) if dirty else FullRenderer(screen)
+    # Destination lists reused every frame of this game, released with it
+    sprites = SpriteBatch()
+    state = GameState(mode_name, seed=random.randrange(2 ** 32))
+    recorder = ReplayRecorder(mode_name, state.seed)
     start_time = time.time()
 
+    timestep = FixedTimestep()
+    fire_pending = False
+    profiler = FrameProfiler() if PROFILE else None
+    prof = profiler or NULL_PROFILER
+    state.profiler = prof
+    overlay = None
+    gc_monitor = GcMonitor().start()
+
     running = True
-    while running:
+    while running and state.running:
+        prof.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.mixer.music.stop()
+                if audio:
+                    pygame.mixer.music.stop()
                 pygame.quit()
                 sys.exit(0)
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 running = False
             if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                now = frame
-                if now - last_shot > 10:
-                    bullets.append(pygame.Rect(player.centerx - 3, player.top - 12, 6, 12))
-                    last_shot = now
-                    if assets["sounds"]["shoot"]:
-                        assets["sounds"]["shoot"].play()
+                fire_pending = True
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                if prof.enabled:
+                    prof = NULL_PROFILER
+                else:
+                    profiler = profiler or FrameProfiler()
+                    prof = profiler
+                    prof.begin_frame()
+                state.profiler = prof
+                # Repaint everything once as the overlay comes or goes
+                canvas.invalidate()
+            if event.type == pygame.WINDOWEXPOSED:
+                # Regions uncovered by another window are not in the dirty rects
+                canvas.invalidate()
 
         keys = pygame.key.get_pressed()
+        held = 0
         if keys[pygame.K_LEFT]:
-            player.x -= player_speed
+            held |= INPUT_LEFT
         if keys[pygame.K_RIGHT]:
-            player.x += player_speed
-        player.x = max(10, min(WIDTH - player.width - 10, player.x))
-
-        if frame % cfg["spawn_rate"] == 0:
-            enemies.append(spawn_enemy(cfg))
-
-        for b in bullets:
-            b.y += cfg["bullet_speed"]
-        bullets = [b for b in bullets if b.bottom > 0]
-
-        for e in enemies:
-            e["y"] += e["speed"]
-            if cfg["enemy_shape"] in ("triangle", "asteroid"):
-                e["x"] += math.sin((frame + e["y"]) * 0.03) * (1 if cfg["enemy_shape"] == "triangle" else 2)
-        enemies = [e for e in enemies if e["y"] - e["size"] < HEIGHT]
-
-        to_remove_b = []
-        to_remove_e = []
-        for i, e in enumerate(enemies):
-            er = enemy_rect(e)
-            for j, b in enumerate(bullets):
-                if er.colliderect(b):
-                    to_remove_b.append(j)
-                    to_remove_e.append(i)
-                    score += 10
-                    if assets["sounds"]["explode"]:
-                        assets["sounds"]["explode"].play()
-                    break
-            if er.colliderect(player):
-                to_remove_e.append(i)
-                lives -= 1
-                if assets["sounds"]["hit"]:
-                    assets["sounds"]["hit"].play()
-                if lives <= 0:
-                    running = False
-                    break
-        to_remove_b = sorted(set(to_remove_b), reverse=True)
-        to_remove_e = sorted(set(to_remove_e), reverse=True)
-        for idx in to_remove_b:
-            if 0 <= idx < len(bullets):
-                bullets.pop(idx)
-        for idx in to_remove_e:
-            if 0 <= idx < len(enemies):
-                enemies.pop(idx)
-
-        frame += 1
-        draw_background(screen, cfg, assets, frame)
-
-        if assets["player"]:
-            screen.blit(assets["player"], (player.x, player.y))
-        else:
-            pygame.draw.rect(screen, (0, 255, 0), player)
-        
-        for b in bullets:
-            if assets["bullet"]:
-                screen.blit(assets["bullet"], (b.x, b.y))
-            else:
-                pygame.draw.rect(screen, cfg["palette"]["bullet"], b)
-        
-        for e in enemies:
-            if assets["enemies"][e["shape"]]:
-                screen.blit(assets["enemies"][e["shape"]], (e["x"] - e["size"], e["y"] - e["size"]))
-            else:
-                pygame.draw.circle(screen, (255, 0, 0), (int(e["x"]), int(e["y"])), e["size"])
-
-        hud = font.render(f"Mode: {mode_name}   Score: {score}   Lives: {lives}", True, (240, 240, 240))
-        screen.blit(hud, (14, 10))
-
-        pygame.display.flip()
-        clock.tick(FPS)
-
-    pygame.mixer.music.stop()
+            held |= INPUT_RIGHT
+        prof.mark("input")
+
+        for _ in range(timestep.advance()):
+            # A fire press is consumed by the first tick after it arrives
+            inputs = held | (INPUT_FIRE if fire_pending else 0)
+            recorder.record(inputs)
+            step(state, inputs)
+            fire_pending = False
+            for name in state.events:
+                AUDIO.play(name)
+            if not state.running:
+                break
+        AUDIO.flush()
+
+        draw_game(canvas, state, assets, font, digits, timestep.alpha, prof, sprites)
+        if prof.enabled:
+            overlay = overlay or ProfileOverlay(pygame.font.SysFont("couriernew,monospace", 14))
+            overlay.draw(canvas, prof)
+            prof.mark("overlay")
+        canvas.present()
+        prof.mark("flip")
+        prof.end_frame()
+        if launch_time:
+            print(f"Time to first frame: {(time.perf_counter() - launch_time) * 1000:.1f} ms")
+            launch_time = None
+        clock.tick(render_fps)
+
+    if audio:
+        pygame.mixer.music.stop()
     duration = time.time() - start_time
-    game_over(screen, bigfont, score)
-    pygame.display.quit()
+    gc_monitor.stop()
+    print(f"Render CPU per frame: {canvas.cpu_per_frame_ms():.2f} ms ({'dirty rects' if dirty else 'full flip'})")
+    print(gc_monitor.report())
+    text = TEXT_CACHE.stats()
+    print(f"Text cache: {text['hits']} hits, {text['misses']} misses, {text['evictions']} evictions, "
+          f"{text['size']} surfaces held; {digits.blits} digit glyph blits")
+    if profiler and profiler.frames:
+        try:
+            profiler.dump(PROFILE_OUT)
+            print(f"Frame profile ({profiler.frames} frames): {PROFILE_OUT}.csv, {PROFILE_OUT}.trace.json")
+        except OSError as e:
+            print(f"Could not write frame profile: {e}")
 
+    # Saved in the background while the game over screen is up
+    from modules.scorewriter import SCORE_WRITER
     player_name = os.getenv("USER") or os.getenv("USERNAME") or "Player"
-    db_add_score(player_name, mode_name, score, duration)
+    played_at = datetime.now().isoformat(timespec='seconds')
+    SCORE_WRITER.submit_score(player_name, mode_name, state.score, duration, played_at)
+    try:
+        save_replay(recorder.to_replay(player_name, state.score, played_at))
+    except OSError as e:
+        print(f"Could not save replay: {e}")
+    game_over(screen, bigfont, state.score)
+    pygame.display.quit()
+    SCORE_WRITER.flush()
 
+    from modules.ui import open_scoreboard
     open_scoreboard({
         "player": player_name,
         "mode": mode_name,
-        "score": score,
+        "score": state.score,
         "duration_sec": duration,
-        "played_at": datetime.now().isoformat(timespec='seconds'),
+        "played_at": played_at,
     })
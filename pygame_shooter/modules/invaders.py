@@ -34,6 +34,12 @@ from sqlalchemy import create_engine, Column, Integer, String, Float, CheckConst
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
+# Shared broadphase (importable both as a package module and as a script)
+try:
+    from modules.collision import SpatialHash, find_hits, rects_overlap
+except ImportError:
+    from collision import SpatialHash, find_hits, rects_overlap
+
 # Constants
 WIDTH, HEIGHT = 900, 650
 FPS = 60
@@ -412,6 +418,10 @@ def enemy_rect(enemy):
     size = enemy["size"]
     return pygame.Rect(enemy["x"] - size, enemy["y"] - size, size * 2, size * 2)
 
+def enemy_bounds(enemy):
+    size = enemy["size"]
+    return (int(enemy["x"] - size), int(enemy["y"] - size), size * 2, size * 2)
+
 def run_game(mode_name: str = "Easy"):
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -442,6 +452,7 @@ def run_game(mode_name: str = "Easy"):
     frame = 0
     last_shot = 0
     start_time = time.time()
+    grid = SpatialHash()
 
     running = True
     while running:
@@ -483,17 +494,17 @@ def run_game(mode_name: str = "Easy"):
 
         to_remove_b = []
         to_remove_e = []
-        for i, e in enumerate(enemies):
-            er = enemy_rect(e)
-            for j, b in enumerate(bullets):
-                if er.colliderect(b):
-                    to_remove_b.append(j)
-                    to_remove_e.append(i)
-                    score += 10
-                    if assets["sounds"]["explode"]:
-                        assets["sounds"]["explode"].play()
-                    break
-            if er.colliderect(player):
+        boxes = [enemy_bounds(e) for e in enemies]
+        hits = dict(find_hits(boxes, bullets, grid=grid))
+        for i, box in enumerate(boxes):
+            j = hits.get(i)
+            if j is not None:
+                to_remove_b.append(j)
+                to_remove_e.append(i)
+                score += 10
+                if assets["sounds"]["explode"]:
+                    assets["sounds"]["explode"].play()
+            if rects_overlap(box, player):
                 to_remove_e.append(i)
                 lives -= 1
                 if assets["sounds"]["hit"]:
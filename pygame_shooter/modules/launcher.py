@@ -0,0 +1,103 @@
+"""
+Pygame launcher menu: mode buttons over a drifting starfield
+"""
+import sys
+import pygame
+from modules.config import WIDTH, HEIGHT, DIRTY_RECTS
+from modules.textcache import TEXT_CACHE
+from modules.assets import ASSETS
+from modules.render import FullRenderer, DirtyRenderer
+from modules.starfield import Starfield
+
+def launcher_buttons():
+    """The (label, rect) mode buttons of the launcher"""
+    bw, bh = 240, 70
+    by = 220
+    gap = 20
+    labels = ["Easy", "Medium", "Hard"]
+    return [(lbl, pygame.Rect(WIDTH // 2 - bw // 2, by + idx * (bh + gap), bw, bh)) for idx, lbl in enumerate(labels)]
+
+def draw_launcher_ui(surface, bigfont, footer_font, buttons):
+    """Draw the launcher title, buttons and footer; return the rects they cover"""
+    rects = []
+    title = TEXT_CACHE.render(bigfont, "SPACE SHOOTER", (255, 255, 255))
+    rects.append(surface.blit(title, (WIDTH // 2 - title.get_width() // 2, 60)))
+
+    for idx, (lbl, rect) in enumerate(buttons):
+        color = (40, 140, 255) if idx == 0 else (80, 200, 120) if idx == 1 else (220, 80, 220)
+        rects.append(pygame.draw.rect(surface, color, rect, border_radius=16))
+        txt = TEXT_CACHE.render(bigfont, lbl, (15, 15, 25))
+        surface.blit(txt, (rect.centerx - txt.get_width() // 2, rect.centery - txt.get_height() // 2))
+
+    footer = TEXT_CACHE.render(
+        footer_font,
+        "Click a mode to start. After the game, a Tkinter scoreboard opens.",
+        (210, 210, 210)
+    )
+    rects.append(surface.blit(footer, (WIDTH // 2 - footer.get_width() // 2, HEIGHT - 60)))
+    return rects
+
+def launcher_menu(screen, clock, bigfont, dirty: bool = DIRTY_RECTS, on_shown=None):
+    """Display the Pygame launcher menu.
+
+    With dirty=True the title, buttons and footer are composed once into a
+    static background and only the moving stars are redrawn and updated.
+    on_shown() is called once the first frame is on screen, to start work
+    that should not delay it.
+    """
+    running = True
+    frame = 0
+    buttons = launcher_buttons()
+    footer_font = pygame.font.SysFont("arial", 18)
+    hovered = None
+    stars = Starfield.drifting()
+    ASSETS.preload()
+
+    canvas = FullRenderer(screen)
+    if dirty:
+        ui_layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        ui_rects = draw_launcher_ui(ui_layer, bigfont, footer_font, buttons)
+        background = pygame.Surface((WIDTH, HEIGHT))
+        background.fill((6, 6, 20))
+        background.blit(ui_layer, (0, 0))
+        canvas = DirtyRenderer(screen, background)
+    
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit(0)
+            if event.type == pygame.MOUSEMOTION:
+                # Start decoding the hovered mode's assets before it is clicked
+                for label, rect in buttons:
+                    if rect.collidepoint(event.pos) and label != hovered:
+                        hovered = label
+                        ASSETS.preload(label)
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mx, my = event.pos
+                for label, rect in buttons:
+                    if rect.collidepoint(mx, my):
+                        ASSETS.preload(label)
+                        print(f"Launcher render CPU per frame: {canvas.cpu_per_frame_ms():.2f} ms "
+                              f"({'dirty rects' if dirty else 'full flip'})")
+                        return label
+
+        canvas.begin()
+        if not canvas.static:
+            screen.fill((6, 6, 20))
+        star_rects = stars.draw(canvas, frame)
+        if canvas.static:
+            for r in star_rects:
+                if r.collidelist(ui_rects) >= 0:
+                    # Keep the UI on top of stars passing behind it
+                    screen.blit(ui_layer, r, r)
+
+        if not canvas.static:
+            draw_launcher_ui(screen, bigfont, footer_font, buttons)
+
+        canvas.present()
+        if on_shown:
+            on_shown()
+            on_shown = None
+        clock.tick(60)
+        frame += 1
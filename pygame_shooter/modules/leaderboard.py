@@ -0,0 +1,154 @@
+"""
+In-memory leaderboard cache, kept in step with the database on every write
+"""
+import threading
+from modules.config import LEADERBOARD_SIZE
+from modules.sortedboard import SortedBoard
+from modules.database import (SCORE_LISTENERS, db_count_scores, db_top_scores, db_get_scores_window,
+                              db_get_scores_page, db_all_stats, db_player_stats, db_mode_stats, MODES)
+
+def score_key(row):
+    """Ascending sort key for (id, player, mode, score, duration_sec, played_at); larger ranks first"""
+    return (row[3], row[5], row[0])
+
+def stats_key(stats):
+    """Display order key for a stats dict: best first, then player and mode, as db_all_stats"""
+    return (-stats["best"], stats["player"], stats["mode"])
+
+class LeaderboardCache:
+    """Per-mode SortedBoards for the scores table (None is the all-modes board).
+
+    Boards are filled from the database on first use (or by warm()) and
+    patched by the database's write notifications, so filter switches and
+    top-N reads are answered from memory.
+    """
+
+    def __init__(self, capacity: int = LEADERBOARD_SIZE):
+        self.capacity = capacity
+        self.boards = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def warm(self):
+        """Fill every board up front"""
+        for mode in (None,) + MODES:
+            with self._lock:
+                self._board(mode)
+
+    def _board(self, mode):
+        board = self.boards.get(mode)
+        if board is None or board.needs_fill():
+            board = SortedBoard(score_key, reverse=True, capacity=self.capacity)
+            board.fill(db_top_scores(self.capacity, mode), db_count_scores(mode))
+            self.boards[mode] = board
+        return board
+
+    def on_write(self, removed, added):
+        """Database write notification: patch affected boards, or drop them all if rows are unknown"""
+        with self._lock:
+            if removed is None:
+                self.boards.clear()
+                return
+            for rows, apply in ((removed, SortedBoard.remove), (added, SortedBoard.add)):
+                for row in rows:
+                    for mode in (None, row[2]):
+                        board = self.boards.get(mode)
+                        if board is not None:
+                            apply(board, row)
+
+    def _served(self, result):
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def count(self, mode: str = None) -> int:
+        with self._lock:
+            return self._board(mode).count
+
+    def top(self, limit: int = 10, mode: str = None):
+        """The best `limit` scores, as db_top_scores"""
+        return self.window(mode, 0, limit)
+
+    def window(self, mode: str = None, offset: int = 0, limit: int = 50):
+        """As db_get_scores_window, from memory when the window is held"""
+        with self._lock:
+            rows = self._served(self._board(mode).window(offset, limit))
+        return rows if rows is not None else db_get_scores_window(mode, offset, limit)
+
+    def page(self, mode: str = None, after: tuple = None, limit: int = 50, before: tuple = None):
+        """As db_get_scores_page, from memory when the page is held"""
+        with self._lock:
+            rows = self._served(self._board(mode).page(after, limit, before))
+        return rows if rows is not None else db_get_scores_page(mode, after, limit, before)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "boards": len(self.boards)}
+
+class StatsCache:
+    """The per-(player, mode) and per-mode aggregates, held in memory.
+
+    Filled from the stats tables on first use (or by warm()); each write
+    notification re-reads only the (player, mode) and mode rows it
+    touched, so switching the scoreboard's mode filter needs no query.
+    """
+
+    def __init__(self):
+        self.players = None  # (player, mode) -> db_player_stats dict
+        self.modes = {}      # mode -> db_mode_stats dict
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Fill the cache up front"""
+        with self._lock:
+            self._fill()
+
+    def _fill(self):
+        if self.players is None:
+            self.players = {(s["player"], s["mode"]): s for s in db_all_stats()}
+            self.modes = {mode: db_mode_stats(mode) for mode in MODES}
+
+    def on_write(self, removed, added):
+        """Database write notification: re-read the aggregates the rows belong to, or drop everything if unknown"""
+        with self._lock:
+            if removed is None:
+                self.players = None
+                return
+            if self.players is None:
+                return
+            keys = {(row[1], row[2]) for rows in (removed, added) for row in rows}
+            for player, mode in keys:
+                stats = db_player_stats(player, mode)
+                if stats:
+                    self.players[(player, mode)] = stats
+                else:
+                    self.players.pop((player, mode), None)
+            for mode in {mode for _, mode in keys}:
+                self.modes[mode] = db_mode_stats(mode)
+
+    def all(self, mode: str = None):
+        """As db_all_stats"""
+        with self._lock:
+            self._fill()
+            rows = [s for s in self.players.values() if not mode or s["mode"] == mode]
+        return sorted(rows, key=stats_key)
+
+    def player(self, player: str, mode: str):
+        """As db_player_stats"""
+        with self._lock:
+            self._fill()
+            return self.players.get((player, mode))
+
+    def mode(self, mode: str):
+        """As db_mode_stats"""
+        with self._lock:
+            self._fill()
+            return self.modes.get(mode)
+
+# Shared by the scoreboard UI; kept current by every database write
+LEADERBOARD = LeaderboardCache()
+STATS = StatsCache()
+SCORE_LISTENERS.append(LEADERBOARD.on_write)
+SCORE_LISTENERS.append(STATS.on_write)
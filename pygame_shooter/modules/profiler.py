@@ -0,0 +1,163 @@
+"""
+Per-frame phase timings: ring buffer, on-screen percentiles and trace dumps
+"""
+import csv
+import gc
+import json
+from array import array
+from time import perf_counter_ns
+from modules.config import PROFILE_FRAMES
+
+# Frame phases in the order run_game passes through them
+PHASES = ("input", "spawn_move", "collision", "background", "sprites", "hud", "overlay", "flip")
+_INDEX = {name: i for i, name in enumerate(PHASES)}
+
+class FrameProfiler:
+    """Per-phase nanosecond timings for the last `capacity` frames.
+
+    begin_frame() starts the clock; each mark(phase) charges the time since
+    the previous mark to that phase, so the marks split a frame into
+    back-to-back slices. A phase marked several times in one frame (e.g.
+    once per simulation tick) accumulates.
+    """
+    enabled = True
+
+    def __init__(self, capacity: int = PROFILE_FRAMES):
+        self.capacity = capacity
+        self.times = array("q", bytes(8 * capacity * len(PHASES)))
+        self.starts = array("q", bytes(8 * capacity))
+        self.frames = 0
+        self._row = 0
+        self._last = 0
+
+    def begin_frame(self):
+        self._row = (self.frames % self.capacity) * len(PHASES)
+        for i in range(self._row, self._row + len(PHASES)):
+            self.times[i] = 0
+        self._last = perf_counter_ns()
+        self.starts[self.frames % self.capacity] = self._last
+
+    def mark(self, phase: str):
+        now = perf_counter_ns()
+        self.times[self._row + _INDEX[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        self.frames += 1
+
+    def _held(self):
+        """Ring indexes of the recorded frames, oldest first"""
+        n = min(self.frames, self.capacity)
+        first = self.frames - n
+        return [(first + k) % self.capacity for k in range(n)]
+
+    def percentiles(self, qs=(0.5, 0.95, 0.99)) -> dict:
+        """Phase name (plus "frame" for the total) -> [ms at each quantile]"""
+        held = self._held()
+        if not held:
+            return {}
+        width = len(PHASES)
+        columns = [[self.times[f * width + p] for f in held] for p in range(width)]
+        columns.append([sum(self.times[f * width:(f + 1) * width]) for f in held])
+        result = {}
+        for name, values in zip(PHASES + ("frame",), columns):
+            values.sort()
+            result[name] = [values[min(len(values) - 1, int(q * len(values)))] / 1e6 for q in qs]
+        return result
+
+    def dump(self, prefix: str):
+        """Write <prefix>.csv (microseconds per phase per frame) and <prefix>.trace.json (Chrome trace)"""
+        width = len(PHASES)
+        events = []
+        with open(prefix + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame",) + PHASES)
+            for k, slot in enumerate(self._held()):
+                row = self.times[slot * width:(slot + 1) * width]
+                writer.writerow([k] + [round(ns / 1000, 1) for ns in row])
+                ts = self.starts[slot]
+                for name, ns in zip(PHASES, row):
+                    if ns:
+                        events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                                       "ts": ts / 1000, "dur": ns / 1000})
+                    ts += ns
+        with open(prefix + ".trace.json", "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+class NullProfiler:
+    """Stand-in used while profiling is off: every hook is an empty method"""
+    enabled = False
+    frames = 0
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase: str):
+        pass
+
+    def end_frame(self):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+class ProfileOverlay:
+    """Table of per-phase p50/p95/p99 frame times, re-rendered every `every` frames"""
+
+    def __init__(self, font, every: int = 30, color=(255, 255, 120)):
+        self.font = font
+        self.every = every
+        self.color = color
+        self.surface = None
+        self._frame = -1
+
+    def draw(self, canvas, profiler, pos=(14, 40)):
+        if self.surface is None or profiler.frames - self._frame >= self.every:
+            self._frame = profiler.frames
+            self.surface = self._render(profiler.percentiles())
+        if self.surface is not None:
+            canvas.blit(self.surface, pos)
+
+    def _render(self, stats):
+        if not stats:
+            return None
+        import pygame
+        lines = [f"{'phase':<11}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        lines += [f"{name:<11}" + "".join(f"{v:>7.2f}" for v in values) for name, values in stats.items()]
+        rendered = [self.font.render(line, True, self.color) for line in lines]
+        height = self.font.get_linesize()
+        surf = pygame.Surface((max(r.get_width() for r in rendered) + 12, height * len(rendered) + 8), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+        for i, r in enumerate(rendered):
+            surf.blit(r, (6, 4 + i * height))
+        return surf
+
+class GcMonitor:
+    """Count garbage collections per generation and time their pauses via gc.callbacks"""
+
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pause_ns = 0
+        self.max_pause_ns = 0
+        self._t0 = 0
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._t0 = perf_counter_ns()
+            return
+        pause = perf_counter_ns() - self._t0
+        self.collections[info["generation"]] += 1
+        self.pause_ns += pause
+        self.max_pause_ns = max(self.max_pause_ns, pause)
+
+    def start(self):
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+        return self
+
+    def stop(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def report(self) -> str:
+        return (f"GC: {sum(self.collections)} collections (gen0/1/2 {'/'.join(map(str, self.collections))}), "
+                f"{self.pause_ns / 1e6:.2f} ms paused, longest {self.max_pause_ns / 1e6:.2f} ms")
@@ -0,0 +1,129 @@
+"""
+Frame presenters: full-screen flips or dirty-rectangle updates
+"""
+import time
+from itertools import repeat
+import pygame
+
+class FullRenderer:
+    """Redraw everything and flip the whole display each frame"""
+    static = False
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.frames = 0
+        self.cpu = 0.0
+        self._t0 = 0.0
+
+    def begin(self):
+        """Start a frame"""
+        self._t0 = time.process_time()
+
+    def blit(self, surf, pos):
+        return self.screen.blit(surf, pos)
+
+    def blits(self, seq):
+        # Nothing needs the rects of a full flip, so skip building them
+        self.screen.blits(seq, doreturn=False)
+
+    def mark(self, rect):
+        """Record a region drawn directly on the screen (e.g. by pygame.draw)"""
+        return rect
+
+    def invalidate(self):
+        """Force the next frame to repaint the whole screen; every full flip already does"""
+
+    def present(self):
+        """Show the frame"""
+        pygame.display.flip()
+        self._tally()
+
+    def _tally(self):
+        self.cpu += time.process_time() - self._t0
+        self.frames += 1
+
+    def cpu_per_frame_ms(self) -> float:
+        """Average CPU time from begin() to present(), in milliseconds"""
+        return self.cpu / self.frames * 1000 if self.frames else 0.0
+
+class DirtyRenderer(FullRenderer):
+    """Over a static background, redraw and update only the regions that changed.
+
+    Each frame restores last frame's sprite rects from the background, draws
+    the new sprites through blit()/blits()/mark() so their rects are recorded,
+    then passes old and new rects to pygame.display.update.
+    """
+    static = True
+
+    def __init__(self, screen, background):
+        super().__init__(screen)
+        self.background = background
+        self.prev = []
+        self.dirty = []
+        self.full = True
+
+    def invalidate(self):
+        """Force the next frame to repaint and flip the whole screen"""
+        self.full = True
+
+    def begin(self):
+        super().begin()
+        bg, screen = self.background, self.screen
+        if self.full:
+            screen.blit(bg, (0, 0))
+        else:
+            for r in self.prev:
+                screen.blit(bg, r, r)
+
+    def blit(self, surf, pos):
+        rect = self.screen.blit(surf, pos)
+        self.dirty.append(rect)
+        return rect
+
+    def blits(self, seq):
+        rects = self.screen.blits(seq)
+        self.dirty.extend(rects)
+        return rects
+
+    def mark(self, rect):
+        self.dirty.append(rect)
+        return rect
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+            self.full = False
+        else:
+            self.prev.extend(self.dirty)
+            pygame.display.update(self.prev)
+        self.prev, self.dirty = self.dirty, self.prev
+        self.dirty.clear()
+        self._tally()
+
+class SpriteBatch:
+    """Sprite destinations grouped by texture, drawn with one blits() call per texture.
+
+    Destination lists are kept per texture and emptied in place each frame,
+    so a steady scene reuses the same lists; draw() pairs each list with its
+    surface through itertools.repeat instead of building (surface, dest)
+    tuples up front.
+    """
+
+    def __init__(self):
+        self.groups = {}
+
+    def begin(self):
+        for dests in self.groups.values():
+            dests.clear()
+
+    def dests(self, surf):
+        """The destination list for a texture; append (x, y) positions to it"""
+        dests = self.groups.get(surf)
+        if dests is None:
+            dests = self.groups[surf] = []
+        return dests
+
+    def draw(self, canvas):
+        for surf, dests in self.groups.items():
+            if dests:
+                canvas.blits(zip(repeat(surf), dests))
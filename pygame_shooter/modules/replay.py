@@ -0,0 +1,214 @@
+"""
+Compact game replays: seed, mode and run-length encoded per-tick inputs
+
+A replay holds everything GameState needs to reproduce a run, so playing
+it back headless yields the exact score the player got. Audit stored
+scores in bulk, from the pygame_shooter directory, with:
+    python -m modules.replay audit replays/
+    python -m modules.replay show replays/<file>.ssr
+
+File layout (little-endian):
+    header   magic "SSRP", version, mode index, seed u32, ticks u32, score u32
+    strings  player, played_at: u8 length + UTF-8 bytes each
+    runs     input bitmask byte + LEB128 varint run length, until end of file
+"""
+import argparse
+import os
+import re
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from modules.config import REPLAY_DIR
+from modules.simulation import GameState, step
+
+MAGIC = b"SSRP"
+# Bumped whenever simulation results change, so stale replays are rejected
+VERSION = 3
+# Index stored in the header; append new modes, never reorder
+REPLAY_MODES = ("Easy", "Medium", "Hard")
+HEADER = struct.Struct("<4sBBIII")
+
+class ReplayRecorder:
+    """Collect a game's inputs one tick at a time as (mask, run length) pairs.
+
+    record() only extends the current run or starts a new one, so it costs
+    well under a microsecond a tick; nothing is encoded until save().
+    """
+
+    def __init__(self, mode: str, seed: int):
+        self.mode = mode
+        self.seed = seed
+        self.masks = []
+        self.lengths = []
+        self.ticks = 0
+
+    def record(self, inputs: int):
+        """Append the input bitmask applied on one tick"""
+        self.ticks += 1
+        if self.masks and self.masks[-1] == inputs:
+            self.lengths[-1] += 1
+        else:
+            self.masks.append(inputs)
+            self.lengths.append(1)
+
+    def to_replay(self, player: str, score: int, played_at: str) -> "Replay":
+        return Replay(self.mode, self.seed, list(zip(self.masks, self.lengths)), score, player, played_at)
+
+class Replay:
+    """A decoded replay: (mask, length) runs plus the run's identity and claimed score"""
+
+    def __init__(self, mode: str, seed: int, runs, score: int = 0, player: str = "", played_at: str = ""):
+        self.mode = mode
+        self.seed = seed
+        self.runs = runs
+        self.score = score
+        self.player = player
+        self.played_at = played_at
+
+    @property
+    def ticks(self) -> int:
+        return sum(n for _, n in self.runs)
+
+    def encode(self) -> bytes:
+        out = bytearray(HEADER.pack(MAGIC, VERSION, REPLAY_MODES.index(self.mode), self.seed, self.ticks, self.score))
+        for text in (self.player, self.played_at):
+            raw = text.encode("utf-8")[:255]
+            out.append(len(raw))
+            out += raw
+        for mask, n in self.runs:
+            out.append(mask)
+            while n > 0x7F:
+                out.append(0x80 | (n & 0x7F))
+                n >>= 7
+            out.append(n)
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "Replay":
+        """Parse encoded bytes; raises ValueError if they are not a complete replay"""
+        if len(data) < HEADER.size:
+            raise ValueError("Replay is truncated")
+        magic, version, mode, seed, ticks, score = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or mode >= len(REPLAY_MODES):
+            raise ValueError("Not a replay file, or an unsupported version")
+        pos = HEADER.size
+        strings = []
+        for _ in range(2):
+            n = data[pos] if pos < len(data) else 0
+            strings.append(data[pos + 1:pos + 1 + n].decode("utf-8", "replace"))
+            pos += 1 + n
+        runs = []
+        end = len(data)
+        while pos < end:
+            mask = data[pos]
+            pos += 1
+            n = shift = 0
+            while True:
+                if pos >= end:
+                    raise ValueError("Replay is truncated")
+                b = data[pos]
+                pos += 1
+                n |= (b & 0x7F) << shift
+                if b < 0x80:
+                    break
+                shift += 7
+            runs.append((mask, n))
+        replay = cls(REPLAY_MODES[mode], seed, runs, score, *strings)
+        if replay.ticks != ticks:
+            raise ValueError("Replay tick count does not match its header")
+        return replay
+
+def save_replay(replay: Replay, directory: str = REPLAY_DIR) -> str:
+    """Write a replay under directory, named after the player and time, and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    stamp = re.sub(r"[^0-9A-Za-z]", "", replay.played_at)
+    name = re.sub(r"[^0-9A-Za-z_-]", "_", replay.player)[:32]
+    path = os.path.join(directory, f"{stamp}_{replay.mode}_{name}_{replay.seed}.ssr")
+    with open(path, "wb") as f:
+        f.write(replay.encode())
+    return path
+
+def load_replay(path: str) -> Replay:
+    with open(path, "rb") as f:
+        return Replay.decode(f.read())
+
+def play_replay(replay: Replay) -> GameState:
+    """Re-simulate a replay headless, as fast as possible, and return the final state"""
+    state = GameState(replay.mode, replay.seed)
+    _step = step
+    for mask, n in replay.runs:
+        for _ in range(n):
+            _step(state, mask)
+    return state
+
+def verify_file(path: str):
+    """Worker entry point: (path, replay or None, simulated score or error text)"""
+    try:
+        replay = load_replay(path)
+    except (OSError, ValueError) as e:
+        return path, None, str(e)
+    return path, replay, play_replay(replay).score
+
+def iter_replay_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".ssr"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+def audit(paths, workers: int = None, chunk: int = 16):
+    """Replay every file and compare with the header and the stored `scores` rows.
+
+    Returns (checked, problems) where problems lists (path, reason).
+    """
+    from modules.database import db_find_scores
+    checked = 0
+    problems = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, replay, result in pool.map(verify_file, iter_replay_files(paths), chunksize=chunk):
+            checked += 1
+            if replay is None:
+                problems.append((path, f"unreadable: {result}"))
+                continue
+            if result != replay.score:
+                problems.append((path, f"replay scores {result}, recorded as {replay.score}"))
+            stored = [row[3] for row in db_find_scores(replay.player, replay.mode, replay.played_at)]
+            if not stored:
+                problems.append((path, "no matching row in scores"))
+            elif result not in stored:
+                problems.append((path, f"replay scores {result}, scores table has {', '.join(map(str, stored))}"))
+    return checked, problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and audit game replays")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_audit = sub.add_parser("audit", help="re-simulate replays and check them against the scores table")
+    p_audit.add_argument("paths", nargs="+", help="replay files or directories")
+    p_audit.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    p_show = sub.add_parser("show", help="print a replay's header and re-simulated score")
+    p_show.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        t0 = time.perf_counter()
+        _, replay, result = verify_file(args.path)
+        if replay is None:
+            parser.exit(1, f"{args.path}: {result}\n")
+        elapsed = time.perf_counter() - t0
+        print(f"{replay.player} | {replay.mode} | {replay.played_at} | seed {replay.seed}")
+        print(f"{replay.ticks} ticks in {len(replay.runs)} runs, recorded score {replay.score}")
+        print(f"Replayed score {result} in {elapsed * 1000:.1f} ms ({replay.ticks / elapsed:.0f} ticks/s)")
+        return
+
+    t0 = time.perf_counter()
+    checked, problems = audit(args.paths, args.workers)
+    for path, reason in problems:
+        print(f"{path}: {reason}")
+    print(f"Audited {checked} replays in {time.perf_counter() - t0:.1f}s, {len(problems)} problem(s)")
+    if problems:
+        parser.exit(1)
+
+if __name__ == "__main__":
+    main()
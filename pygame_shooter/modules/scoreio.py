@@ -0,0 +1,199 @@
+"""
+Bulk import and export of scores as CSV or JSONL
+
+Both directions stream: files are read and written row by row and the
+database is written in large executemany transactions, so memory use does
+not grow with the file. Run from the pygame_shooter directory, e.g.:
+    python -m modules.scoreio import cabinet1.csv cabinet2.jsonl
+    python -m modules.scoreio export scores.jsonl --mode Hard
+"""
+import argparse
+import csv
+import json
+import operator
+import os
+import sys
+import time
+from datetime import datetime
+from modules.database import (db_init, db_drop_indexes, db_rebuild_indexes, db_import_rows, db_export_rows, db_count_scores,
+                              IMPORT_COLUMNS, MODES)
+
+EXPORT_FIELDS = ("id",) + IMPORT_COLUMNS
+FORMATS = ("csv", "jsonl")
+MAX_SAMPLES = 10
+# Rough size of one exported row, for guessing how many rows a file holds
+BYTES_PER_ROW = 50
+# Smaller imports keep their indexes: below this, a rebuild saves tens of milliseconds at most
+REBUILD_MIN_ROWS = 10000
+
+class ImportReport:
+    """Rejected-row count plus the first few reasons, for files of any size"""
+
+    def __init__(self):
+        self.rejected = 0
+        self.samples = []
+
+    def reject(self, record_no: int, reason: str):
+        self.rejected += 1
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append((record_no, reason))
+
+def guess_format(path: str) -> str:
+    """csv or jsonl from the file extension (CSV unless it looks like JSON lines)"""
+    return "jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson", ".json") else "csv"
+
+def read_csv(f):
+    """Yield one IMPORT_COLUMNS-ordered tuple per CSV data row, matched up by the header (a reason string for short rows)"""
+    reader = csv.reader(f)
+    header = next(reader, [])
+    missing = [c for c in IMPORT_COLUMNS if c not in header and c != "played_at"]
+    if missing:
+        raise ValueError(f"CSV header is missing {', '.join(missing)}")
+    positions = [header.index(c) if c in header else None for c in IMPORT_COLUMNS]
+    if None in positions:
+        # played_at is optional; pad each row so the column reads as empty
+        positions[-1] = len(header)
+        reader = (row + [""] for row in reader)
+    pick = operator.itemgetter(*positions)
+    for row in reader:
+        try:
+            yield pick(row)
+        except IndexError:
+            yield "short row"
+
+def read_jsonl(f):
+    """Yield one IMPORT_COLUMNS-ordered tuple per non-blank line (a reason string for lines that are not JSON objects)"""
+    loads = json.loads
+    for line in f:
+        if line.strip():
+            try:
+                rec = loads(line)
+            except ValueError as e:
+                yield f"invalid JSON ({e})"
+                continue
+            if isinstance(rec, dict):
+                yield tuple(rec.get(c) for c in IMPORT_COLUMNS)
+            else:
+                yield f"not a JSON object ({type(rec).__name__})"
+
+def clean_rows(records, report: ImportReport):
+    """Yield insertable tuples, rejecting records that would fail check_mode or the column types.
+
+    Checking here lets the database take whole chunks with executemany
+    instead of learning about a bad row by failing its transaction.
+    """
+    modes = frozenset(MODES)
+    now = datetime.now().isoformat(timespec='seconds')
+    for n, rec in enumerate(records, 1):
+        if type(rec) is str:
+            report.reject(n, rec)  # The reader could not make a record of it
+            continue
+        try:
+            player, mode, score, duration_sec, played_at = rec
+            if mode not in modes:
+                report.reject(n, f"mode {mode!r} is not one of {', '.join(MODES)}")
+            elif not player:
+                report.reject(n, "empty player")
+            else:
+                yield (player, mode, int(score), float(duration_sec), played_at or now)
+        except (TypeError, ValueError) as e:
+            report.reject(n, f"malformed record ({type(e).__name__}: {e})")
+
+def write_csv(f, rows) -> int:
+    """Write a header and the rows, returning the row count"""
+    writer = csv.writer(f)
+    writer.writerow(EXPORT_FIELDS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def write_jsonl(f, rows) -> int:
+    """Write one JSON object per row, returning the row count"""
+    count = 0
+    dumps = json.dumps
+    for row in rows:
+        f.write(dumps(dict(zip(EXPORT_FIELDS, row))) + "\n")
+        count += 1
+    return count
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl}
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl}
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return os.fdopen(os.dup((sys.stdin if "r" in mode else sys.stdout).fileno()), mode, newline="", encoding="utf-8")
+    return open(path, mode, newline="", encoding="utf-8")
+
+def import_file(path: str, fmt: str = None, chunk_size: int = 50000):
+    """Import one file and return (rows written, ImportReport)"""
+    report = ImportReport()
+    with _open(path, "r") as f:
+        rows = clean_rows(READERS[fmt or guess_format(path)](f), report)
+        written = db_import_rows(rows, chunk_size)
+    return written, report
+
+def export_file(path: str, fmt: str = None, mode_filter: str = None, chunk_size: int = 50000) -> int:
+    """Export scores (optionally one mode's) and return the row count"""
+    with _open(path, "w") as f:
+        return WRITERS[fmt or guess_format(path)](f, db_export_rows(mode_filter, chunk_size))
+
+def should_rebuild_indexes(paths) -> bool:
+    """Whether dropping and rebuilding the indexes beats maintaining them row by row.
+
+    Rebuilding costs time in proportion to the whole table and maintaining
+    costs more per imported row, so rebuild when the files are likely to add
+    at least REBUILD_MIN_ROWS rows and at least half as many as the table
+    already has.
+    """
+    if "-" in paths:
+        return False
+    incoming = sum(os.path.getsize(p) for p in paths if os.path.exists(p)) // BYTES_PER_ROW
+    return incoming >= REBUILD_MIN_ROWS and incoming >= db_count_scores() // 2
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream scores between the database and CSV/JSONL files")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="append scores from files")
+    imp.add_argument("files", nargs="+", help="CSV or JSONL files ('-' for stdin)")
+    imp.add_argument("--indexes", choices=("auto", "keep", "rebuild"), default="auto",
+                     help="maintain indexes during the load or drop and rebuild them afterwards "
+                          "(auto: rebuild when the files are large compared to the table)")
+    exp = sub.add_parser("export", help="write all scores to a file")
+    exp.add_argument("file", help="output file ('-' for stdout)")
+    exp.add_argument("--mode", choices=MODES, default=None, help="only export this mode")
+    for p in (imp, exp):
+        p.add_argument("--format", choices=FORMATS, default=None, help="override the format implied by the extension")
+        p.add_argument("--chunk", type=int, default=50000, help="rows per transaction / fetch")
+    args = parser.parse_args(argv)
+
+    db_init()
+    t0 = time.perf_counter()
+    if args.command == "import":
+        total = 0
+        rebuild = args.indexes == "rebuild" or (args.indexes == "auto" and should_rebuild_indexes(args.files))
+        if rebuild:
+            db_drop_indexes()
+        try:
+            for path in args.files:
+                try:
+                    written, report = import_file(path, args.format, args.chunk)
+                except (OSError, ValueError) as e:
+                    print(f"{path}: {e}", file=sys.stderr)
+                    continue
+                total += written
+                print(f"{path}: imported {written} rows, rejected {report.rejected}", file=sys.stderr)
+                for n, reason in report.samples:
+                    print(f"  record {n}: {reason}", file=sys.stderr)
+        finally:
+            if rebuild:
+                db_rebuild_indexes()
+    else:
+        total = export_file(args.file, args.format, args.mode, args.chunk)
+        print(f"Exported {total} rows to {args.file}", file=sys.stderr)
+    elapsed = time.perf_counter() - t0
+    print(f"{total} rows in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
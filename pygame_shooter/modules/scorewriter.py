@@ -0,0 +1,181 @@
+"""
+Background persistence of scores (and other records) off the game thread
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+from modules.config import JOURNAL_FILE
+from modules.database import db_add_scores
+
+# Record kind -> function writing a batch of payloads in one transaction
+HANDLERS = {
+    "score": db_add_scores,
+}
+
+def _read_journal(path: str):
+    """Return the journal entries never marked done and the highest seq the journal has used"""
+    entries = {}
+    done = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from a crash mid-write
+                if "done" in rec:
+                    done.update(rec["done"])
+                else:
+                    entries[rec["seq"]] = rec
+    except FileNotFoundError:
+        return [], 0
+    top = max(max(entries, default=0), max(done, default=0))
+    return [entries[seq] for seq in sorted(entries) if seq not in done], top
+
+def replay_journal(path: str = JOURNAL_FILE) -> int:
+    """Write any journaled records that never reached the database, then reset the journal"""
+    pending, _ = _read_journal(path)
+    by_kind = {}
+    for rec in pending:
+        by_kind.setdefault(rec["kind"], []).append(rec["data"])
+    for kind, payloads in by_kind.items():
+        if not HANDLERS[kind](payloads):
+            return 0  # Keep the journal for the next attempt
+    if os.path.exists(path):
+        os.remove(path)
+    if pending:
+        print(f"Recovered {len(pending)} unsaved record(s) from {path}")
+    return len(pending)
+
+class ScoreWriter:
+    """Bounded queue drained by one background thread that writes in batches.
+
+    submit() appends the record to an append-only journal and queues it;
+    the writer thread groups whatever is queued into one transaction per
+    record kind, then marks those records done in the journal. The journal
+    is emptied once every record it holds is done (a failed write keeps
+    its records until the next db_init replays them, as do records left by
+    an earlier process whose replay failed), and replayed by db_init if
+    the process died with records still pending.
+    """
+
+    def __init__(self, journal_path: str = JOURNAL_FILE, maxsize: int = 256, batch_size: int = 64):
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._journal = None
+        self._thread = None
+        self._seq = 0
+        # Journaled records not yet written, including any whose write failed
+        self._undone = set()
+        self.batches = 0
+        self.written = 0
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def submit(self, kind: str, data: dict):
+        """Journal and queue one record; blocks only if the queue is full"""
+        with self._lock:
+            self._start()
+            if self._journal is None:
+                self._open_journal()
+            self._seq += 1
+            self._undone.add(self._seq)
+            rec = {"seq": self._seq, "kind": kind, "data": data}
+            self._journal.write(json.dumps(rec) + "\n")
+            self._journal.flush()
+        self.queue.put(rec)
+
+    def _open_journal(self):
+        # Number after anything an earlier process left, so its done markers never match our records
+        left, top = _read_journal(self.journal_path)
+        self._seq = max(self._seq, top)
+        self._undone.update(rec["seq"] for rec in left)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def submit_score(self, player: str, mode: str, score: int, duration_sec: float, played_at: str = None):
+        """Queue a finished game's score"""
+        self.submit("score", {
+            "player": player,
+            "mode": mode,
+            "score": int(score),
+            "duration_sec": float(duration_sec),
+            "played_at": played_at or datetime.now().isoformat(timespec='seconds'),
+        })
+
+    def _run(self):
+        while True:
+            rec = self.queue.get()
+            if rec is None:
+                self.queue.task_done()
+                return
+            batch = [rec]
+            while len(batch) < self.batch_size:
+                try:
+                    nxt = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self.queue.put(None)  # Finish this batch first, then stop
+                    self.queue.task_done()
+                    break
+                batch.append(nxt)
+            try:
+                self._write(batch)
+            except Exception as e:
+                # The records stay journaled as undone, so db_init retries them
+                print(f"Error writing {len(batch)} record(s): {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _write(self, batch):
+        by_kind = {}
+        for rec in batch:
+            by_kind.setdefault(rec["kind"], []).append(rec)
+        done = []
+        for kind, recs in by_kind.items():
+            if HANDLERS[kind]([r["data"] for r in recs]):
+                done.extend(r["seq"] for r in recs)
+        self.batches += 1
+        self.written += len(done)
+
+        with self._lock:
+            self._undone.difference_update(done)
+            if self._journal is None:
+                return
+            if not self._undone:
+                # Everything journaled reached the database: start the journal afresh
+                self._journal.seek(0)
+                self._journal.truncate()
+            elif done:
+                self._journal.write(json.dumps({"done": done}) + "\n")
+                self._journal.flush()
+
+    def flush(self):
+        """Block until every queued record has been written"""
+        if self._thread is not None:
+            self.queue.join()
+
+    def close(self):
+        """Flush pending records and stop the writer thread"""
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+# Shared writer for the game process
+SCORE_WRITER = ScoreWriter()
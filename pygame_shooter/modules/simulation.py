@@ -0,0 +1,167 @@
+"""
+Headless, deterministic game simulation (no display, mixer or clock)
+"""
+import random
+from modules.config import WIDTH, HEIGHT, FPS, MODE_CONFIGS
+from modules.collision import SpatialHash
+from modules.entities import EnemyPool, BulletPool
+from modules.profiler import NULL_PROFILER
+
+# Per-tick input bitmask
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4
+
+PLAYER_W, PLAYER_H = 50, 40
+FIRE_COOLDOWN = 10
+
+class GameState:
+    """Everything needed to advance one game, independent of pygame"""
+
+    def __init__(self, mode_name: str = "Easy", seed: int = None, overrides: dict = None):
+        if mode_name not in MODE_CONFIGS:
+            mode_name = "Easy"
+        self.mode = mode_name
+        self.cfg = dict(MODE_CONFIGS[mode_name], **overrides) if overrides else MODE_CONFIGS[mode_name]
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.player_x = WIDTH // 2 - PLAYER_W // 2
+        self.prev_player_x = self.player_x
+        self.player_y = HEIGHT - 70
+        self.bullets = BulletPool()
+        self.enemies = EnemyPool()
+        self.grid = SpatialHash()
+        # Scratch lists reused by collide() every tick
+        self.dead = []
+        self.spent = []
+        self.hits = []
+
+        self.score = 0
+        self.lives = 3 if mode_name != "Hard" else 2
+        self.frame = 0
+        self.last_shot = 0
+        self.shots = 0
+        self.kills = 0
+        self.running = True
+        # Sound cues raised by the last step: "shoot", "explode", "hit"
+        self.events = []
+        # Charged with spawn/move and collision time by step()
+        self.profiler = NULL_PROFILER
+
+    @property
+    def player_rect(self):
+        """The player's (x, y, w, h) bounds"""
+        return (self.player_x, self.player_y, PLAYER_W, PLAYER_H)
+
+    @property
+    def duration_sec(self) -> float:
+        """Simulated play time at the nominal frame rate"""
+        return self.frame / FPS
+
+def spawn_enemy(mode_cfg, enemies, rng):
+    """Spawn a new enemy at a random position into the enemy pool"""
+    x = rng.randint(20, WIDTH - 20)
+    y = -30
+    speed = mode_cfg["enemy_speed"]
+    shape = mode_cfg["enemy_shape"]
+    size = 18
+    return enemies.spawn(x, y, speed, shape, size)
+
+def collide(state: GameState):
+    """Resolve bullet/enemy and enemy/player hits straight from the pool arrays.
+
+    Each enemy takes the oldest bullet it overlaps (bullets are not
+    consumed, as several enemies may share one) and costs a life if it
+    touches the player. Swap-remove reorders the pools, so the enemies
+    that hit something are sorted back into spawn order before the hits
+    are scored; the loop they replace stopped at the fatal hit, and
+    later enemies' kills must not count. Hit slots are gathered into
+    reused lists and released highest first, as swap-remove requires, so
+    a tick only allocates a tuple per enemy that hits something.
+    """
+    enemies, bullets, grid = state.enemies, state.bullets, state.grid
+    dead, spent, hits, events = state.dead, state.spent, state.hits, state.events
+    bx, by, bw, bh = bullets.x, bullets.y, bullets.width, bullets.height
+    grid.reset()
+    for j in range(bullets.count):
+        grid.insert_box(j, bx[j], by[j], bw, bh)
+
+    px, py = state.player_x, state.player_y
+    ex, ey, sizes, eseq, bseq = enemies.x, enemies.y, enemies.size, enemies.seq, bullets.seq
+    for i in range(enemies.count):
+        size = sizes[i]
+        x, y, w = int(ex[i] - size), int(ey[i] - size), size * 2
+        j = grid.first_overlap(x, y, w, w, bx, by, bw, bh, bseq) if bullets.count else -1
+        touch = x < px + PLAYER_W and px < x + w and y < py + PLAYER_H and py < y + w
+        if j >= 0 or touch:
+            hits.append((eseq[i], i, j, touch))
+
+    hits.sort()
+    for _, i, j, touch in hits:
+        if j >= 0:
+            spent.append(j)
+            dead.append(i)
+            state.score += 10
+            state.kills += 1
+            events.append("explode")
+        if touch:
+            if j < 0:
+                dead.append(i)
+            state.lives -= 1
+            events.append("hit")
+            if state.lives <= 0:
+                state.running = False
+                break
+
+    spent.sort()
+    last = -1
+    for j in reversed(spent):
+        if j != last:
+            bullets.release(j)
+            last = j
+    dead.sort()
+    for i in reversed(dead):
+        enemies.release(i)
+    hits.clear()
+    spent.clear()
+    dead.clear()
+
+def step(state: GameState, inputs: int) -> GameState:
+    """Advance the game by one tick using an INPUT_* bitmask and return the state"""
+    events = state.events
+    events.clear()
+    if not state.running:
+        return state
+
+    cfg = state.cfg
+    bullets, enemies = state.bullets, state.enemies
+    frame = state.frame
+
+    if inputs & INPUT_FIRE and frame - state.last_shot > FIRE_COOLDOWN:
+        bullets.spawn(state.player_x + PLAYER_W // 2 - 3, state.player_y - 12)
+        state.last_shot = frame
+        state.shots += 1
+        events.append("shoot")
+
+    state.prev_player_x = state.player_x
+    speed = cfg["player_speed"]
+    if inputs & INPUT_LEFT:
+        state.player_x -= speed
+    if inputs & INPUT_RIGHT:
+        state.player_x += speed
+    state.player_x = max(10, min(WIDTH - PLAYER_W - 10, state.player_x))
+
+    if frame % cfg["spawn_rate"] == 0:
+        spawn_enemy(cfg, enemies, state.rng)
+
+    bullets.move(cfg["bullet_speed"])
+    enemies.move(frame, HEIGHT)
+    state.profiler.mark("spawn_move")
+
+    if enemies.count:
+        collide(state)
+    state.profiler.mark("collision")
+
+    state.frame = frame + 1
+    return state
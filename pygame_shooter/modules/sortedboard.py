@@ -0,0 +1,130 @@
+"""
+Bounded sorted leaderboard held in memory and patched row by row
+"""
+from bisect import bisect_left, bisect_right
+from modules.config import LEADERBOARD_SIZE
+
+class SortedBoard:
+    """The best `capacity` rows of one leaderboard, kept sorted with bisect.
+
+    Rows are stored ascending by key; with reverse=True the largest key
+    ranks first. When the board holds fewer rows than exist (`complete` is
+    False) it only answers for ranks it has; reads that reach past its last
+    row return None so the caller can go to the database instead.
+    """
+
+    def __init__(self, key, reverse: bool = False, capacity: int = LEADERBOARD_SIZE):
+        self.key = key
+        self.reverse = reverse
+        self.capacity = capacity
+        self.rows = []
+        self.count = 0
+        self.complete = False
+
+    def fill(self, best_rows, count: int):
+        """Load the leading rows of the leaderboard and the size of the whole board"""
+        self.rows = sorted(best_rows[:self.capacity], key=self.key)
+        self.count = count
+        self.complete = count <= len(self.rows)
+
+    def _worse(self, a, b) -> bool:
+        """Whether key a ranks below key b"""
+        return a < b if self.reverse else a > b
+
+    def covers(self, row) -> bool:
+        """Whether every row ranking above `row` is held"""
+        if self.complete:
+            return True
+        if not self.rows:
+            return False
+        last = self.rows[0] if self.reverse else self.rows[-1]
+        return not self._worse(self.key(row), self.key(last))
+
+    def add(self, row):
+        k = self.key(row)
+        i = bisect_left(self.rows, k, key=self.key)
+        if i < len(self.rows) and self.key(self.rows[i]) == k:
+            return  # Already read in by a fill that raced with the write
+        self.count += 1
+        if not self.covers(row):
+            return  # Ranks below what we hold; it stays in the database only
+        self.rows.insert(i, row)
+        if len(self.rows) > self.capacity:
+            del self.rows[0 if self.reverse else -1]
+            self.complete = False
+
+    def remove(self, row):
+        self.count -= 1
+        k = self.key(row)
+        i = bisect_left(self.rows, k, key=self.key)
+        if i < len(self.rows) and self.key(self.rows[i]) == k:
+            del self.rows[i]
+
+    def needs_fill(self) -> bool:
+        """Deletes have eaten into the cached head far enough to reload it"""
+        return not self.complete and len(self.rows) < self.capacity // 2
+
+    def window(self, offset: int, limit: int):
+        """Rows ranked offset .. offset+limit-1, best first (None if not all held)"""
+        if offset + limit > len(self.rows) and not self.complete:
+            return None
+        if self.reverse:
+            end = max(0, len(self.rows) - offset)
+            return self.rows[max(0, end - limit):end][::-1]
+        return self.rows[offset:offset + limit]
+
+    def page(self, after=None, limit: int = 50, before=None):
+        """Keyset page next to a row, like db_get_scores_page (None if not all held)"""
+        edge = after or before
+        if not self.covers(edge):
+            return None
+        rows, k = self.rows, self.key(edge)
+        if after:
+            # Strictly worse than `after`
+            i = bisect_left(rows, k, key=self.key) if self.reverse else bisect_right(rows, k, key=self.key)
+            page = rows[max(0, i - limit):i][::-1] if self.reverse else rows[i:i + limit]
+        else:
+            # Strictly better than `before`, the nearest `limit` of them
+            i = bisect_right(rows, k, key=self.key) if self.reverse else bisect_left(rows, k, key=self.key)
+            page = rows[i:i + limit][::-1] if self.reverse else rows[max(0, i - limit):i]
+            # covers() means every row above `before` is held, so a short page is the top of the board
+            return page
+        if len(page) < limit and not self.complete:
+            return None
+        return page
+
+def score_table_key(row):
+    """Key for (id, player, score, created_at) rows: best score first, then oldest, then lowest id"""
+    return (-row[2], row[3], row[0])
+
+class TopScores:
+    """Cached head of a plain sqlite3 `scores(id, player, score, created_at)` table.
+
+    Used by the standalone scripts in Modules/. The board is filled from
+    the table on the first read; add() patches in a row the caller has
+    just inserted, and reads deeper than the board go to the table.
+    """
+    COLUMNS = "SELECT id, player, score, created_at FROM scores"
+    # Same order as score_table_key, so the cache and the table agree on ties
+    ORDER = " ORDER BY score DESC, created_at ASC, id ASC LIMIT ?"
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.board = None
+
+    def add(self, row):
+        """Patch a newly inserted (id, player, score, created_at) row in, once the board is filled"""
+        if self.board is not None:
+            self.board.add(row)
+
+    def top(self, conn, limit: int = 10):
+        """The best `limit` scores as (player, score, created_at) rows"""
+        if self.board is None:
+            board = SortedBoard(score_table_key, capacity=self.capacity)
+            board.fill(conn.execute(self.COLUMNS + self.ORDER, (self.capacity,)).fetchall(),
+                       conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0])
+            self.board = board
+        rows = self.board.window(0, limit)
+        if rows is None:
+            rows = conn.execute(self.COLUMNS + self.ORDER, (limit,)).fetchall()
+        return [row[1:] for row in rows]
@@ -0,0 +1,89 @@
+"""
+Procedural starfield: precomputed star tables, pre-rendered sprites, one blits() per frame
+"""
+import math
+import random
+from itertools import repeat
+import pygame
+from modules.config import WIDTH, HEIGHT
+
+def star_sprite(radius: int, color):
+    """A filled circle of `radius` on a transparent surface"""
+    surf = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+    pygame.draw.circle(surf, color, (radius, radius), radius)
+    # Match the display's pixel format when there is one, so blits need no conversion
+    return surf.convert_alpha() if pygame.display.get_surface() else surf
+
+def pixel_sprites(levels: int = 4, color=(255, 255, 255)):
+    """1x1 sprites from dim to full `color`, for twinkling"""
+    sprites = []
+    for k in range(1, levels + 1):
+        surf = pygame.Surface((1, 1))
+        surf.fill(tuple(c * k // levels for c in color))
+        sprites.append(surf.convert() if pygame.display.get_surface() else surf)
+    return sprites
+
+class Starfield:
+    """Stars at fixed base positions, drifting, bobbing and twinkling on precomputed tables.
+
+    Everything that depends only on the frame number is tabulated up front:
+    the vertical bob is one sine period sampled per frame, the twinkle is
+    a repeating sprite-index cycle. A frame then only adds offsets to the
+    base positions in one comprehension and draws every star with a single
+    blits() call.
+    """
+
+    def __init__(self, xs, ys, sprites, drift: int = 0, bob: int = 0, bob_period: int = 126,
+                 twinkle_period: int = 0, size=(WIDTH, HEIGHT), seed: int = 0):
+        self.xs = list(xs)
+        self.ys = list(ys)
+        self.sprites = list(sprites)
+        self.drift = drift
+        self.width, self.height = size
+        # Star i at frame f is bobbed by bob_table[(f + i) % bob_period]
+        self.bob_table = [int(math.sin(2 * math.pi * k / bob_period) * bob) for k in range(bob_period)] if bob else None
+        # Sprites are drawn centred on the star position
+        self.anchors = [(s.get_width() // 2, s.get_height() // 2) for s in self.sprites]
+        rng = random.Random(seed)
+        if twinkle_period and len(self.sprites) > 1:
+            # Brightness ramps up and back down over a period, each star at its own phase
+            ramp = list(range(len(self.sprites))) + list(range(len(self.sprites) - 2, 0, -1))
+            self.twinkle = [ramp[k * len(ramp) // twinkle_period] for k in range(twinkle_period)]
+            self.phases = [rng.randrange(twinkle_period) for _ in self.xs]
+        else:
+            self.twinkle = None
+            self.phases = None
+
+    @classmethod
+    def drifting(cls, count: int = 70, color=(200, 200, 255), radius: int = 2):
+        """The launcher's stars: a lattice drifting right while each star bobs on a sine"""
+        return cls([i * 31 for i in range(count)], [i * 13 for i in range(count)],
+                   [star_sprite(radius, color)], drift=2, bob=50)
+
+    @classmethod
+    def twinkling(cls, count: int = 80, size=(WIDTH, HEIGHT), seed: int = None):
+        """Scattered single-pixel stars that twinkle in place"""
+        rng = random.Random(seed)
+        w, h = size
+        return cls([rng.randrange(w) for _ in range(count)], [rng.randrange(h) for _ in range(count)],
+                   pixel_sprites(), twinkle_period=48, size=size, seed=rng.randrange(2 ** 32))
+
+    def positions(self, frame: int):
+        """Top-left blit positions of every star at `frame`"""
+        w, h = self.width, self.height
+        ax, ay = self.anchors[0]
+        dx = frame * self.drift - ax
+        table = self.bob_table
+        if table is None:
+            return [((x + dx) % w, (y - ay) % h) for x, y in zip(self.xs, self.ys)]
+        n = len(table)
+        return [((x + dx) % w, (y + table[(frame + i) % n] - ay) % h)
+                for i, (x, y) in enumerate(zip(self.xs, self.ys))]
+
+    def draw(self, target, frame: int):
+        """Draw every star on a surface or renderer with one blits() call; returns its result"""
+        dests = self.positions(frame)
+        if self.twinkle is None:
+            return target.blits(zip(repeat(self.sprites[0]), dests))
+        sprites, twinkle, n = self.sprites, self.twinkle, len(self.twinkle)
+        return target.blits([(sprites[twinkle[(frame + p) % n]], d) for p, d in zip(self.phases, dests)])
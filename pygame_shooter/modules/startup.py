@@ -0,0 +1,86 @@
+"""
+Startup import budget, measured with python -X importtime
+
+Imports main.py in fresh interpreters, as launching the game does, and
+reports how long its imports take, the slowest of them, and any module
+that startup is meant to leave for later. From the pygame_shooter
+directory:
+    python -m modules.startup
+    python -m modules.startup --budget 200 --repeat 9
+Exits non-zero when over budget or when a deferred module was imported.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from modules.config import STARTUP_BUDGET_MS
+
+# Loaded on first use (the database thread, the scoreboard, the game), never by main.py's imports
+DEFERRED = ("sqlalchemy", "tkinter", "modules.database", "modules.leaderboard", "modules.ui", "modules.game")
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+def import_times(target: str = "main", cwd: str = None):
+    """(module, self us, cumulative us, depth) for each import made importing `target` in a fresh interpreter"""
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                          cwd=cwd, env=env, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"import {target} failed: {proc.stderr.strip().splitlines()[-1]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return rows
+
+def subtree(rows, target: str = "main"):
+    """The rows imported on behalf of `target`, ending with its own row.
+
+    importtime prints a module after everything it imported, indented one
+    level deeper, so they are the deeper rows directly above it.
+    """
+    end = max(i for i, row in enumerate(rows) if row[0] == target and row[3] == 0)
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+def report(runs, budget_ms: float, top: int = 10) -> bool:
+    """Print the budget check for several runs' subtrees; True if within budget"""
+    totals = [run[-1][2] / 1000 for run in runs]
+    best = runs[totals.index(min(totals))]
+    ok = min(totals) <= budget_ms
+    print(f"main.py imports: best {min(totals):.1f} ms, median {statistics.median(totals):.1f} ms "
+          f"over {len(runs)} runs; budget {budget_ms:.0f} ms {'OK' if ok else 'EXCEEDED'}")
+    print(f"\n{'direct import':<44} {'ms':>8}")
+    for name, _, cumulative, _ in sorted((r for r in best if r[3] == 1), key=lambda r: -r[2])[:top]:
+        print(f"{name:<44} {cumulative / 1000:>8.1f}")
+    print(f"\n{'slowest module (self)':<44} {'ms':>8}")
+    for name, own, _, _ in sorted(best, key=lambda r: -r[1])[:top]:
+        print(f"{name:<44} {own / 1000:>8.1f}")
+    eager = sorted({r[0] for run in runs for r in run if r[0].split(".")[0] in DEFERRED or r[0] in DEFERRED})
+    if eager:
+        print(f"\nImported at startup but meant to be deferred: {', '.join(eager)}")
+    return ok and not eager
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check main.py's import time against the startup budget")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="milliseconds (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to measure (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="rows per table (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    try:
+        runs = [subtree(import_times("main", root)) for _ in range(args.repeat)]
+    except RuntimeError as e:
+        parser.exit(2, f"{e}\n")
+    if not report(runs, args.budget, args.top):
+        parser.exit(1)
+
+if __name__ == "__main__":
+    main()
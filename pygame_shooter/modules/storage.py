@@ -0,0 +1,52 @@
+"""
+Shared SQLite tuning and connection reuse for every scores database
+"""
+import sqlite3
+import threading
+
+# WAL lets readers run while a write commits; NORMAL only syncs at checkpoints
+PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16000),            # Negative means KiB: a 16 MB page cache
+    ("mmap_size", 64 * 1024 * 1024),   # Read pages straight from the OS page cache
+    ("temp_store", "MEMORY"),
+)
+
+# Compiled statements kept per connection, keyed by SQL text
+STATEMENT_CACHE = 256
+
+def apply_pragmas(conn):
+    """Apply the tuning PRAGMAs to a DB-API sqlite3 connection"""
+    cursor = conn.cursor()
+    try:
+        for name, value in PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+_local = threading.local()
+
+def connect(path: str):
+    """Get this thread's tuned connection to path, opening it on first use.
+
+    Reusing one connection keeps the page cache warm and lets sqlite3 reuse
+    its prepared statements instead of re-parsing SQL on every call.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE)
+        apply_pragmas(conn)
+        conns[path] = conn
+    return conn
+
+def close(path: str = None):
+    """Close this thread's connection to path (or all of them)"""
+    conns = getattr(_local, "conns", {})
+    for p in [path] if path else list(conns):
+        conn = conns.pop(p, None)
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,63 @@
+"""
+Cached text rendering: LRU text surfaces and a digit glyph atlas
+"""
+from collections import OrderedDict
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color)"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text: str, color, antialias: bool = True):
+        """Return a surface for text, rendering it only on a cache miss"""
+        key = (font, text, color, antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def clear(self):
+        """Drop every cached surface; the counters keep running"""
+        self.surfaces.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters; misses stop growing once text is steady"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.surfaces)}
+
+class GlyphAtlas:
+    """Pre-rendered single-character glyphs used to compose changing numbers"""
+
+    def __init__(self, font, color, chars: str = "0123456789-"):
+        self.glyphs = {c: font.render(c, True, color) for c in chars}
+        self.height = font.get_height()
+        self.blits = 0
+
+    def draw(self, screen, text: str, pos) -> int:
+        """Blit text glyph by glyph at pos and return the drawn width"""
+        x, y = pos
+        start = x
+        glyphs = self.glyphs
+        seq = []
+        for c in text:
+            g = glyphs[c]
+            seq.append((g, (x, y)))
+            x += g.get_width()
+        screen.blits(seq)
+        self.blits += len(seq)
+        return x - start
+
+# Shared by the launcher and the game so surfaces survive restarts
+TEXT_CACHE = TextCache()
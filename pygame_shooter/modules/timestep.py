@@ -0,0 +1,51 @@
+"""
+Fixed-timestep accumulator that decouples simulation rate from render rate
+"""
+import time
+from modules.config import FPS, MAX_FRAME_STEPS
+
+class FixedTimestep:
+    """Turn variable frame times into a whole number of fixed-length ticks.
+
+    Each rendered frame calls advance() to learn how many simulation ticks to
+    run, then draws with alpha (0..1) to interpolate between the previous and
+    current tick. Frame time is clamped to max_steps ticks so a long stall
+    slows the game down instead of triggering a spiral of catch-up ticks.
+    """
+
+    def __init__(self, hz: int = FPS, max_steps: int = MAX_FRAME_STEPS, clock=time.perf_counter):
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last = None
+        self.dropped = 0.0
+
+    def advance(self) -> int:
+        """Add the time since the last call and return the number of ticks due"""
+        now = self.clock()
+        if self.last is None:
+            # First frame: run one tick so there is something to draw
+            self.last = now
+            return 1
+        elapsed = now - self.last
+        self.last = now
+
+        limit = self.dt * self.max_steps
+        if elapsed > limit:
+            self.dropped += elapsed - limit
+            elapsed = limit
+        self.accumulator += elapsed
+
+        steps = int(self.accumulator / self.dt)
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """How far the render time sits between the last two ticks"""
+        return self.accumulator / self.dt
+
+def lerp(a: float, b: float, t: float) -> float:
+    """Linear interpolation from a to b"""
+    return a + (b - a) * t
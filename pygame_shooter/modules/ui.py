@@ -1,25 +1,227 @@
 """
-UI components (Tkinter scoreboard and Pygame menus)
+Tkinter scoreboard UI (the Pygame launcher menu is in modules/launcher.py)
 """
-import os
-import sys
 import tkinter as tk
+from bisect import bisect_left
 from tkinter import ttk, messagebox
-import pygame
-import math
-from modules.database import db_get_scores, db_add_score, db_update_score, db_delete_score
-from modules.config import WIDTH, HEIGHT
-from modules.game import run_game
+from modules.database import db_add_score, db_update_score, db_delete_score, db_get_score, MODES
+from modules.leaderboard import LEADERBOARD, STATS, stats_key
+
+def _sort_key(row):
+    """Leaderboard order key for a score tuple (larger sorts first)"""
+    return (row[3], row[5], row[0])
+
+def _row_values(row):
+    rid, player, mode, score, dur, ts = row
+    return (rid, player, mode, score, f"{dur:.1f}", ts)
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+def _sparkline(hist) -> str:
+    """Render histogram counts as a row of block characters"""
+    top = max(hist) or 1
+    return "".join(SPARK_CHARS[round(n / top * (len(SPARK_CHARS) - 1))] for n in hist)
+
+def _stats_values(stats):
+    return (stats["player"], stats["mode"], stats["games"], stats["best"], f"{stats['mean_score']:.1f}",
+            f"{stats['mean_duration']:.1f}", _sparkline(stats["histogram"]))
+
+class StatsTable:
+    """Treeview of per-(player, mode) aggregates in db_all_stats order.
+
+    load() fills it for a mode filter; after a write, put() replaces the
+    one (player, mode) row it changed, as the scores view patches rows.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.mode_filter = None
+        self.keys = []  # stats_key of each shown row, in display order
+        self.iids = {}  # (player, mode) -> Treeview item
+
+    def load(self, rows, mode_filter: str = None):
+        """Show aggregate rows already in display order"""
+        self.mode_filter = mode_filter
+        self.tree.delete(*self.tree.get_children())
+        self.keys = [stats_key(stats) for stats in rows]
+        self.iids = {(stats["player"], stats["mode"]): self.tree.insert("", tk.END, values=_stats_values(stats))
+                     for stats in rows}
+
+    def put(self, player: str, mode: str, stats):
+        """Show a (player, mode) row's new aggregates, or drop the row when stats is None"""
+        if self.mode_filter and mode != self.mode_filter:
+            return
+        iid = self.iids.pop((player, mode), None)
+        if iid is not None:
+            del self.keys[self.tree.index(iid)]
+            self.tree.delete(iid)
+        if stats:
+            key = stats_key(stats)
+            idx = bisect_left(self.keys, key)
+            self.keys.insert(idx, key)
+            self.iids[(player, mode)] = self.tree.insert("", idx, values=_stats_values(stats))
+
+class VirtualScoreboard:
+    """Treeview that holds only the visible window of scoreboard rows.
+
+    Rows are fetched from the leaderboard cache (falling back to the
+    database past its cached head) a page at a time as the user scrolls,
+    and add/update/delete patch single rows, so neither scrolling nor edits
+    cost more as the scores table grows.
+    """
+
+    def __init__(self, parent, columns, height: int = 16):
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=height)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(seq, self.on_wheel)
+
+        self.height = height
+        self.mode_filter = None
+        self.rows = []
+        self.offset = 0
+        self.total = 0
+
+    def load(self, mode_filter: str = None):
+        """Show the top of the leaderboard for a mode filter"""
+        self.mode_filter = mode_filter
+        self.total = LEADERBOARD.count(mode_filter)
+        self.jump(0)
+
+    def jump(self, offset: int):
+        """Show the window starting at row `offset`"""
+        self.offset = max(0, min(offset, self.total - self.height))
+        self.rows = LEADERBOARD.window(self.mode_filter, self.offset, self.height)
+        self.tree.delete(*self.tree.get_children())
+        for row in self.rows:
+            self.tree.insert("", tk.END, iid=str(row[0]), values=_row_values(row))
+        self._update_scrollbar()
+
+    def scroll(self, lines: int):
+        """Scroll by a number of rows, fetching only the rows that come into view"""
+        if not self.rows or abs(lines) >= self.height:
+            self.jump(self.offset + lines)
+            return
+        if lines > 0:
+            new = LEADERBOARD.page(self.mode_filter, after=self.rows[-1], limit=lines)
+            drop = max(0, len(self.rows) + len(new) - self.height)
+            for row in self.rows[:drop]:
+                self.tree.delete(str(row[0]))
+            for row in new:
+                self.tree.insert("", tk.END, iid=str(row[0]), values=_row_values(row))
+            self.rows = self.rows[drop:] + new
+            self.offset += drop
+        elif lines < 0 and self.offset > 0:
+            new = LEADERBOARD.page(self.mode_filter, before=self.rows[0], limit=-lines)
+            keep = len(self.rows) - max(0, len(self.rows) + len(new) - self.height)
+            for row in self.rows[keep:]:
+                self.tree.delete(str(row[0]))
+            for i, row in enumerate(new):
+                self.tree.insert("", i, iid=str(row[0]), values=_row_values(row))
+            self.rows = new + self.rows[:keep]
+            self.offset = max(0, self.offset - len(new))
+        self._update_scrollbar()
+
+    def insert_row(self, row):
+        """Patch a newly added or changed row into the window"""
+        if self.mode_filter and row[2] != self.mode_filter:
+            return
+        self.total += 1
+        iid = str(row[0])
+        if self.tree.exists(iid):
+            # Already pulled in by a refill
+            return
+        key = _sort_key(row)
+        idx = sum(1 for r in self.rows if _sort_key(r) > key)
+        if idx == 0 and self.offset > 0:
+            self.offset += 1  # Belongs above the window
+        elif idx == len(self.rows) and len(self.rows) >= self.height:
+            pass  # Belongs below the window
+        else:
+            self.rows.insert(idx, row)
+            self.tree.insert("", idx, iid=iid, values=_row_values(row))
+            if len(self.rows) > self.height:
+                self.tree.delete(str(self.rows.pop()[0]))
+        self._update_scrollbar()
+
+    def remove_row(self, record_id: int):
+        """Drop a row from the window and pull in one row to fill the gap"""
+        iid = str(record_id)
+        idx = next((i for i, r in enumerate(self.rows) if r[0] == record_id), None)
+        if idx is None:
+            return
+        self.tree.delete(iid)
+        self.rows.pop(idx)
+        self.total -= 1
+        if self.rows and self.offset + len(self.rows) < self.total:
+            for row in LEADERBOARD.page(self.mode_filter, after=self.rows[-1], limit=1):
+                self.rows.append(row)
+                self.tree.insert("", tk.END, iid=str(row[0]), values=_row_values(row))
+        elif self.offset > 0:
+            before = self.rows[0] if self.rows else None
+            new = LEADERBOARD.page(self.mode_filter, before=before, limit=1) if before else \
+                LEADERBOARD.window(self.mode_filter, self.offset - 1, 1)
+            for row in new:
+                self.rows.insert(0, row)
+                self.tree.insert("", 0, iid=str(row[0]), values=_row_values(row))
+                self.offset -= 1
+        self._update_scrollbar()
+
+    def update_row(self, record_id: int):
+        """Re-read one row after an edit and move it to its new position"""
+        self.remove_row(record_id)
+        row = db_get_score(record_id)
+        if row:
+            self.insert_row(row)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.jump(int(float(amount) * self.total))
+        elif action == "scroll":
+            lines = int(amount)
+            self.scroll(lines * self.height if unit == "pages" else lines)
+
+    def on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll(-3)
+        else:
+            self.scroll(3)
+        return "break"
+
+    def _update_scrollbar(self):
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + len(self.rows)) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
 
 def open_scoreboard(last_result: dict = None):
     """Open the Tkinter scoreboard UI"""
     def refresh_tree():
-        for i in tree.get_children():
-            tree.delete(i)
         filt = mode_filter_var.get()
-        filt = None if filt == "All" else filt
-        for rid, player, mode, score, dur, ts in db_get_scores(filt):
-            tree.insert("", tk.END, iid=str(rid), values=(rid, player, mode, score, f"{dur:.1f}", ts))
+        mode = None if filt == "All" else filt
+        table.load(mode)
+        stats_table.load(STATS.all(mode), mode)
+        refresh_summary()
+
+    def patch_stats(*keys):
+        """Patch in the (player, mode) aggregates a write touched (already updated in the cache)"""
+        for player, mode in set(keys):
+            stats_table.put(player, mode, STATS.player(player, mode))
+        refresh_summary()
+
+    def refresh_summary():
+        filt = mode_filter_var.get()
+        mode = None if filt == "All" else filt
+        parts = []
+        for m in [mode] if mode else MODES:
+            summary = STATS.mode(m)
+            if summary:
+                parts.append(f"{m}: {summary['games']} games, best {summary['best']}, "
+                             f"avg {summary['mean_score']:.1f} pts / {summary['mean_duration']:.1f}s")
+        stats_summary.config(text="   |   ".join(parts) or "No games yet")
 
     def on_add():
         try:
@@ -31,8 +233,11 @@ def open_scoreboard(last_result: dict = None):
         except ValueError:
             messagebox.showerror("Invalid Input", "Score must be a non-negative integer.")
             return
-        db_add_score(player, mode, score, 0.0)
-        refresh_tree()
+        rid = db_add_score(player, mode, score, 0.0)
+        row = db_get_score(rid) if rid else None
+        if row:
+            table.insert_row(row)
+            patch_stats((player, mode))
         entry_player.delete(0, tk.END)
         entry_score.delete(0, tk.END)
 
@@ -52,8 +257,11 @@ def open_scoreboard(last_result: dict = None):
         except ValueError:
             messagebox.showerror("Invalid Input", "Score must be a non-negative integer.")
             return
+        old = db_get_score(rid)
         db_update_score(rid, player=player if player else None, mode=mode, score=score_val)
-        refresh_tree()
+        table.update_row(rid)
+        if old:
+            patch_stats((old[1], old[2]), (player or old[1], mode or old[2]))
 
     def on_delete():
         sel = tree.selection()
@@ -62,8 +270,11 @@ def open_scoreboard(last_result: dict = None):
             return
         rid = int(sel[0])
         if messagebox.askyesno("Confirm", f"Delete record #{rid}?"):
+            old = db_get_score(rid)
             db_delete_score(rid)
-            refresh_tree()
+            table.remove_row(rid)
+            if old:
+                patch_stats((old[1], old[2]))
 
     def on_tree_select(event=None):
         sel = tree.selection()
@@ -78,6 +289,7 @@ def open_scoreboard(last_result: dict = None):
         mode_var.set(vals[2])
 
     def launch_from_board(mode_name: str):
+        from modules.game import run_game
         root.destroy()
         run_game(mode_name)
 
@@ -103,15 +315,34 @@ def open_scoreboard(last_result: dict = None):
     ttk.Button(btns, text="Start Medium", command=lambda: launch_from_board("Medium")).pack(side=tk.LEFT, padx=4)
     ttk.Button(btns, text="Start Hard", command=lambda: launch_from_board("Hard")).pack(side=tk.LEFT, padx=4)
 
+    tabs = ttk.Notebook(root)
+    tabs.pack(fill=tk.BOTH, expand=True, padx=10, pady=8)
+
     cols = ("id", "player", "mode", "score", "duration_sec", "played_at")
-    tree = ttk.Treeview(root, columns=cols, show="headings", height=16)
+    table = VirtualScoreboard(tabs, cols, height=16)
+    tree = table.tree
     for c in cols:
         tree.heading(c, text=c)
         tree.column(c, anchor=tk.CENTER, stretch=True, width=100)
     tree.column("player", width=150)
-    tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=8)
+    tabs.add(table.frame, text="Scores")
     tree.bind("<<TreeviewSelect>>", on_tree_select)
 
+    # Per-player and per-mode aggregates, served from the stats cache
+    stats_page = ttk.Frame(tabs)
+    stats_summary = ttk.Label(stats_page, font=("Arial", 10, "bold"))
+    stats_summary.pack(fill=tk.X, pady=4)
+    stats_cols = ("player", "mode", "games", "best", "avg_score", "avg_duration", "distribution")
+    stats_tree = ttk.Treeview(stats_page, columns=stats_cols, show="headings", height=15)
+    for c in stats_cols:
+        stats_tree.heading(c, text=c)
+        stats_tree.column(c, anchor=tk.CENTER, stretch=True, width=90)
+    stats_tree.column("player", width=150)
+    stats_tree.column("distribution", width=200)
+    stats_tree.pack(fill=tk.BOTH, expand=True)
+    stats_table = StatsTable(stats_tree)
+    tabs.add(stats_page, text="Player stats")
+
     form = ttk.Frame(root)
     form.pack(fill=tk.X, padx=10, pady=4)
 
@@ -143,52 +374,3 @@ def open_scoreboard(last_result: dict = None):
         banner.pack(pady=4)
 
     root.mainloop()
-
-def launcher_menu(screen, clock, bigfont):
-    """Display the Pygame launcher menu"""
-    running = True
-    frame = 0
-    buttons = []
-    
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit(0)
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = event.pos
-                for label, rect in buttons:
-                    if rect.collidepoint(mx, my):
-                        return label
-
-        screen.fill((6, 6, 20))
-        for i in range(70):
-            x = (i * 31 + frame * 2) % WIDTH
-            y = (i * 13 + int(math.sin((frame + i) * 0.05) * 50)) % HEIGHT
-            pygame.draw.circle(screen, (200, 200, 255), (x, y), 2)
-
-        title = bigfont.render("SPACE SHOOTER", True, (255, 255, 255))
-        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 60))
-
-        bw, bh = 240, 70
-        by = 220
-        gap = 20
-        labels = ["Easy", "Medium", "Hard"]
-        buttons = []
-        for idx, lbl in enumerate(labels):
-            rect = pygame.Rect(WIDTH // 2 - bw // 2, by + idx * (bh + gap), bw, bh)
-            buttons.append((lbl, rect))
-            color = (40, 140, 255) if idx == 0 else (80, 200, 120) if idx == 1 else (220, 80, 220)
-            pygame.draw.rect(screen, color, rect, border_radius=16)
-            txt = bigfont.render(lbl, True, (15, 15, 25))
-            screen.blit(txt, (rect.centerx - txt.get_width() // 2, rect.centery - txt.get_height() // 2))
-
-        footer = pygame.font.SysFont("arial", 18).render(
-            "Click a mode to start. After the game, a Tkinter scoreboard opens.",
-            True, (210, 210, 210)
-        )
-        screen.blit(footer, (WIDTH // 2 - footer.get_width() // 2, HEIGHT - 60))
-
-        pygame.display.flip()
-        clock.tick(60)
-        frame += 1